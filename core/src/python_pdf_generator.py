@@ -8,7 +8,9 @@ import argparse
 import json
 import sys
 import os
-import tempfile
+from functools import lru_cache
+from itertools import repeat
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -19,123 +21,275 @@ tests_dir = project_root / "tests"
 sys.path.insert(0, str(tests_dir))
 
 try:
-    import jsonschema
-    from jsonschema import validate, ValidationError
-except ImportError:
-    print("❌ Missing dependency: jsonschema")
-    print("   Install with: pip install jsonschema")
-    sys.exit(1)
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib parser
+    orjson = None
 
-try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib import colors
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-    from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-    from reportlab.graphics.shapes import Drawing, Rect
-    from reportlab.graphics import renderPDF
-except ImportError:
-    print("❌ Missing dependency: reportlab")
-    print("   Install with: pip install reportlab")
-    sys.exit(1)
+# Heavy dependencies are imported on first use so --help, argument errors and
+# unreadable certificates don't pay for loading reportlab
 
-try:
-    import qrcode
-    from PIL import Image as PILImage
-except ImportError:
-    print("❌ Missing dependency: qrcode[pil]")
-    print("   Install with: pip install qrcode[pil]")
-    sys.exit(1)
 
-# Import existing PDF generation functions
-try:
-    from test_pdf_certificates import BackupCertificatePDFGenerator
-    from test_wipe_pdf_certificates import create_wipe_certificate_pdf, create_sample_wipe_certificate
-except ImportError as e:
-    print(f"❌ Could not import existing PDF generators: {e}")
-    print("   Make sure you're running from the project root")
+def _missing_dependency(package):
+    print(f"❌ Missing dependency: {package}")
+    print(f"   Install with: pip install {package}")
     sys.exit(1)
 
 
+def _ensure_fastjsonschema():
+    """Import fastjsonschema, which is only needed when validating"""
+    try:
+        import fastjsonschema
+    except ImportError:
+        _missing_dependency("fastjsonschema")
+    return fastjsonschema
+
+
+def _ensure_reportlab():
+    try:
+        import reportlab
+    except ImportError:
+        _missing_dependency("reportlab")
+
+
+def _ensure_qrcode():
+    try:
+        import qrcode
+        import PIL
+    except ImportError:
+        _missing_dependency("qrcode[pil]")
+
+
+def _import_generators():
+    """Import the existing PDF generation functions"""
+    _ensure_reportlab()
+    _ensure_qrcode()
+    try:
+        from test_pdf_certificates import BackupCertificatePDFGenerator
+        from test_wipe_pdf_certificates import create_wipe_certificate_pdf
+    except ImportError as e:
+        # A missing third-party package is reported as such; only a missing
+        # tests/ module means the script isn't running from the project tree
+        missing = e.name if isinstance(e, ModuleNotFoundError) else None
+        if missing and not missing.startswith(("test_", "_")):
+            _missing_dependency(missing.split(".")[0])
+        print(f"❌ Could not import existing PDF generators: {e}")
+        print("   Make sure you're running from the project root")
+        sys.exit(1)
+    return BackupCertificatePDFGenerator, create_wipe_certificate_pdf
+
+
+# Compiled schema validators, keyed by schema type
+_compiled_validators = {}
+
+
+def load_json(path):
+    """Read and parse a JSON file, using orjson straight from bytes when available"""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=None)
 def load_schema(schema_type):
-    """Load the appropriate JSON schema"""
+    """Load the appropriate JSON schema (cached; callers must not mutate it)"""
     schema_path = project_root / "certs" / "schemas" / f"{schema_type}_schema.json"
     if not schema_path.exists():
         raise FileNotFoundError(f"Schema not found: {schema_path}")
     
-    with open(schema_path, 'r') as f:
-        return json.load(f)
+    return load_json(schema_path)
+
+
+def get_validator(schema_type):
+    """Compile the schema for a certificate type once and reuse it"""
+    validator = _compiled_validators.get(schema_type)
+    if validator is None:
+        fastjsonschema = _ensure_fastjsonschema()
+        # Don't inject schema defaults into the certificate being checked
+        validator = fastjsonschema.compile(load_schema(schema_type), use_default=False, use_formats=False)
+        _compiled_validators[schema_type] = validator
+    return validator
 
 
 def validate_certificate(cert_data, schema_type):
     """Validate certificate against schema"""
+    fastjsonschema = _ensure_fastjsonschema()
     try:
-        schema = load_schema(schema_type)
-        validate(instance=cert_data, schema=schema)
+        get_validator(schema_type)(cert_data)
         return True, []
-    except ValidationError as e:
-        return False, [str(e)]
+    except fastjsonschema.JsonSchemaValueException as e:
+        return False, [e.message]
     except Exception as e:
         return False, [f"Validation error: {e}"]
 
 
+def write_pdf(buffer, output_path):
+    """Write a PDF rendered in memory to disk and return the number of bytes written"""
+    with open(output_path, 'wb') as f:
+        return f.write(buffer.getbuffer())
+
+
 def generate_backup_pdf(cert_data, output_path, skip_validation=False):
     """Generate backup certificate PDF using existing high-quality generator"""
+    BackupCertificatePDFGenerator, _ = _import_generators()
     try:
         # Use the existing BackupCertificatePDFGenerator
         generator = BackupCertificatePDFGenerator()
         
-        # Only validate if explicitly requested and not skipped
+        # Only validate if explicitly requested and not skipped. The compiled
+        # validator is used once here, so the generator is told to skip its
+        # own jsonschema.validate() pass.
         if not skip_validation:
-            is_valid = generator.validate_certificate(cert_data)
+            is_valid, errors = validate_certificate(cert_data, "backup")
             if not is_valid:
+                print(f"Schema validation failed: {errors[0]}")
                 print("⚠️  Certificate validation failed, but proceeding with PDF generation")
                 # Don't raise error - proceed with PDF generation for unsigned certs
         
-        # Generate PDF
-        success = generator.create_certificate_pdf(cert_data, output_path, skip_validation)
+        # Generate PDF in memory so its size is known without a stat afterwards
+        buffer = BytesIO()
+        success = generator.create_certificate_pdf(cert_data, buffer, skip_validation=True)
         if not success:
             raise RuntimeError("PDF generation failed")
         
-        return True, output_path
+        return True, write_pdf(buffer, output_path)
     except Exception as e:
         return False, str(e)
 
 
-def generate_wipe_pdf(cert_data, output_path):
-    """Generate wipe certificate PDF using existing high-quality generator"""
+def generate_wipe_pdf(cert_data, output_path, skip_validation=False):
+    """
+    Generate wipe certificate PDF using existing high-quality generator
+    
+    skip_validation is accepted for a common generator signature; the wipe
+    generator doesn't validate.
+    """
+    _, create_wipe_certificate_pdf = _import_generators()
     try:
         # Use the existing wipe certificate generator
-        create_wipe_certificate_pdf(cert_data, output_path)
-        return True, output_path
+        buffer = BytesIO()
+        create_wipe_certificate_pdf(cert_data, buffer)
+        return True, write_pdf(buffer, output_path)
     except Exception as e:
         return False, str(e)
 
 
+# Certificate type -> generator(cert_data, output_path, skip_validation)
+_GENERATORS = {
+    "backup": generate_backup_pdf,
+    "wipe": generate_wipe_pdf,
+}
+
+
+def run_batch_job(job, should_validate, skip_validation):
+    """Generate the PDF for one batch job entry; runs in a worker process"""
+    cert_type = job.get("type")
+    output_path = job.get("output")
+    generator = _GENERATORS.get(cert_type)
+    try:
+        if generator is None:
+            raise ValueError(f"Unknown certificate type: {cert_type}")
+        cert_data = load_json(job["cert_file"])
+        
+        if should_validate:
+            is_valid, errors = validate_certificate(cert_data, cert_type)
+            if not is_valid:
+                raise ValueError(f"Certificate validation failed: {'; '.join(errors[:3])}")
+            # Already validated; the generator must not check again
+            skip_validation = True
+        
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        success, result = generator(cert_data, output_path, skip_validation)
+    except Exception as e:
+        success, result = False, str(e)
+    
+    if success:
+        return {
+            "success": True,
+            "output_path": output_path,
+            "file_size_bytes": result,
+            "certificate_type": cert_type
+        }
+    return {
+        "success": False,
+        "output_path": output_path,
+        "certificate_type": cert_type,
+        "error": result
+    }
+
+
+def run_batch(batch_file, should_validate, skip_validation, workers=None):
+    """Generate every PDF listed in a batch file in parallel worker processes"""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    try:
+        jobs = load_json(batch_file)
+        if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+            raise ValueError("batch file must contain a JSON list of job objects")
+    except Exception as e:
+        print(f"❌ Failed to load batch file: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    print(f"📄 Generating {len(jobs)} certificate PDFs...")
+    
+    # Each worker imports reportlab once and reuses it for all of its jobs
+    with ProcessPoolExecutor(max_workers=workers if workers is not None else os.cpu_count()) as executor:
+        results = list(executor.map(run_batch_job, jobs, repeat(should_validate), repeat(skip_validation)))
+    
+    for result in results:
+        if result["success"]:
+            print(f"✅ {result['output_path']} ({result['file_size_bytes']:,} bytes)")
+        else:
+            print(f"❌ {result['output_path']}: {result['error']}", file=sys.stderr)
+    
+    all_succeeded = all(result["success"] for result in results)
+    result_data = {
+        "success": all_succeeded,
+        "results": results,
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+    print(f"RESULT_JSON: {json.dumps(result_data)}")
+    if not all_succeeded:
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate high-quality PDF certificates')
-    parser.add_argument('--cert-file', required=True, help='Path to certificate JSON file')
-    parser.add_argument('--output', required=True, help='Output PDF path')
-    parser.add_argument('--type', choices=['backup', 'wipe'], required=True, 
+    parser.add_argument('--cert-file', help='Path to certificate JSON file')
+    parser.add_argument('--output', help='Output PDF path')
+    parser.add_argument('--type', choices=sorted(_GENERATORS),
                        help='Certificate type')
+    parser.add_argument('--batch-file',
+                        help='JSON list of {"cert_file", "output", "type"} jobs to generate in parallel')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for --batch-file (default: CPU count)')
     parser.add_argument('--validate', action='store_true', default=False,
                        help='Validate certificate against schema')
     parser.add_argument('--no-validate', action='store_true',
                         help='Skip certificate schema validation (default)')
     
     args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    
+    should_validate = args.validate and not args.no_validate
+    if args.batch_file:
+        run_batch(args.batch_file, should_validate, args.no_validate, args.workers)
+        return
+    if not (args.cert_file and args.output and args.type):
+        parser.error("--cert-file, --output and --type are required unless --batch-file is given")
     
     # Load certificate
     try:
-        with open(args.cert_file, 'r') as f:
-            cert_data = json.load(f)
+        cert_data = load_json(args.cert_file)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
+        print(f"❌ Failed to load certificate: invalid JSON: {e}", file=sys.stderr)
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Failed to load certificate: {e}", file=sys.stderr)
         sys.exit(1)
     
     # Validate only if explicitly requested
-    should_validate = args.validate and not args.no_validate
     if should_validate:
         is_valid, errors = validate_certificate(cert_data, args.type)
         if not is_valid:
@@ -155,14 +309,11 @@ def main():
     # Generate PDF based on type
     print(f"📄 Generating {args.type} certificate PDF...")
     
-    skip_validation = args.no_validate
-    if args.type == 'backup':
-        success, result = generate_backup_pdf(cert_data, str(output_path), skip_validation)
-    else:  # wipe
-        success, result = generate_wipe_pdf(cert_data, str(output_path))
+    # A certificate validated above isn't checked again by the generator
+    success, result = _GENERATORS[args.type](cert_data, str(output_path), args.no_validate or should_validate)
     
     if success:
-        file_size = os.path.getsize(output_path)
+        file_size = result
         print(f"✅ PDF generated successfully: {output_path}")
         print(f"📊 File size: {file_size:,} bytes ({file_size/1024:.1f} KB)")
         
@@ -5,30 +5,41 @@ Validates JSON certificates (backup or wipe) against schemas and provides
 verification results with schema validation.
 """
 
-import json
+import asyncio
+import gzip
 import os
 import hashlib
-import base64
+import hmac
+import binascii
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Literal, Optional, Union
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from pydantic import BaseModel, ValidationError
+import fastjsonschema
 import jsonschema
-from jsonschema import validate, ValidationError as JsonSchemaValidationError
+import orjson
 from nacl.signing import VerifyKey
 from nacl.exceptions import BadSignatureError
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 
+from .result_cache import ResultCache
+from .validator_cache import get_validator, get_compiled_validator
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="SecureWipe Verification Portal",
     description="Validate JSON certificates (backup or wipe) with schema validation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -40,15 +51,62 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    """Render HTTP errors (400/404/413/500...) with orjson like every other response"""
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=headers)
+    return ORJSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=headers)
+
+
 # Global variables for schemas and configuration
 BACKUP_SCHEMA = None
 WIPE_SCHEMA = None
+BACKUP_VALIDATOR = None
+WIPE_VALIDATOR = None
+COMPILED_BACKUP_VALIDATOR = None
+COMPILED_WIPE_VALIDATOR = None
+SCHEMA_VALIDATORS = {}
+
+# Schema errors reported per certificate, matching the PDF generator CLI
+MAX_SCHEMA_ERRORS = 3
+
+# Most certificates accepted by one /verify/batch request
+MAX_BATCH_SIZE = 256
+
+# Worker threads for /verify/batch; PyNaCl releases the GIL while verifying
+# signatures, so independent certificates are checked in parallel
+BATCH_VERIFY_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) + 4),
+    thread_name_prefix="verify-batch"
+)
+
+# Largest accepted /verify body; certificates are a few KB, so anything far
+# larger is rejected before it is buffered or parsed
+MAX_BODY_BYTES = int(os.environ.get("SECUREWIPE_MAX_BODY_BYTES", 1024 * 1024))
+
+# Rendered /verify responses keyed on (SHA-256 of the body, check mode). A
+# result only depends on the body, the schemas and the public key, so clients
+# retrying the same certificate skip verification entirely. Keys are digests
+# rather than bodies so the cache never holds onto request payloads; responses
+# can still echo client strings, so the cache is also capped by total bytes.
+VERIFY_CACHE_SIZE = int(os.environ.get("SECUREWIPE_VERIFY_CACHE_SIZE", 4096))
+VERIFY_CACHE_BYTES = int(os.environ.get("SECUREWIPE_VERIFY_CACHE_BYTES", 16 * 1024 * 1024))
+# Responses for ordinary certificates are a few KB; larger ones are not cached
+VERIFY_CACHE_MAX_ENTRY_BYTES = 64 * 1024
+VERIFY_RESULT_CACHE = ResultCache(VERIFY_CACHE_SIZE, VERIFY_CACHE_BYTES, VERIFY_CACHE_MAX_ENTRY_BYTES)
 PUBLIC_KEY_BYTES = None
+# Reused for every verification; PyNaCl key objects are immutable. libsodium
+# verifies faster here than cryptography's OpenSSL-backed Ed25519PublicKey
+# (~116us vs ~145us for a 3 KB certificate).
+VERIFY_KEY = None
 
 
 def load_public_key():
     """Load Ed25519 public key from PEM file"""
-    global PUBLIC_KEY_BYTES
+    global PUBLIC_KEY_BYTES, VERIFY_KEY
     
     # Get public key path from environment or use default
     pubkey_path = os.environ.get("SECUREWIPE_PUBKEY_PATH", "keys/dev_public.pem")
@@ -61,11 +119,11 @@ def load_public_key():
             pubkey_path = str(fallback_path)
     
     try:
-        with open(pubkey_path, 'r') as f:
+        with open(pubkey_path, 'rb') as f:
             pem_content = f.read()
         
         # Parse PEM public key
-        public_key = serialization.load_pem_public_key(pem_content.encode())
+        public_key = serialization.load_pem_public_key(pem_content)
         
         if not isinstance(public_key, Ed25519PublicKey):
             raise RuntimeError(f"Public key is not Ed25519: {type(public_key)}")
@@ -75,6 +133,9 @@ def load_public_key():
             encoding=serialization.Encoding.Raw,
             format=serialization.PublicFormat.Raw
         )
+        VERIFY_KEY = VerifyKey(PUBLIC_KEY_BYTES)
+        # Cached results were checked against the previous key
+        VERIFY_RESULT_CACHE.clear()
         
     except FileNotFoundError:
         raise RuntimeError(f"Public key file not found: {pubkey_path}")
@@ -83,25 +144,40 @@ def load_public_key():
 
 
 def load_schemas():
-    """Load JSON schemas from files"""
-    global BACKUP_SCHEMA, WIPE_SCHEMA
+    """Load JSON schemas from files and build their validators"""
+    global BACKUP_SCHEMA, WIPE_SCHEMA, BACKUP_VALIDATOR, WIPE_VALIDATOR
+    global COMPILED_BACKUP_VALIDATOR, COMPILED_WIPE_VALIDATOR, SCHEMA_VALIDATORS
     
-    # Get the project root directory
-    current_dir = Path(__file__).parent.parent.parent
-    backup_schema_path = current_dir / "certs" / "schemas" / "backup_schema.json"
-    wipe_schema_path = current_dir / "certs" / "schemas" / "wipe_schema.json"
+    # Schemas live in <project root>/certs/schemas
+    schema_dir = Path(__file__).parent.parent.parent / "certs" / "schemas"
     
+    # Reading both files takes ~0.1ms; startup time is dominated by compiling
+    # the validators below, not by file I/O
     try:
-        with open(backup_schema_path, 'r') as f:
-            BACKUP_SCHEMA = json.load(f)
-        
-        with open(wipe_schema_path, 'r') as f:
-            WIPE_SCHEMA = json.load(f)
-            
+        BACKUP_SCHEMA, WIPE_SCHEMA = (
+            orjson.loads((schema_dir / f"{cert_type}_schema.json").read_bytes())
+            for cert_type in ("backup", "wipe")
+        )
     except FileNotFoundError as e:
         raise RuntimeError(f"Schema file not found: {e}")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise RuntimeError(f"Invalid JSON in schema file: {e}")
+    
+    # Compile validators once; schemas are static for the life of the process
+    try:
+        BACKUP_VALIDATOR = get_validator(BACKUP_SCHEMA)
+        WIPE_VALIDATOR = get_validator(WIPE_SCHEMA)
+        COMPILED_BACKUP_VALIDATOR = get_compiled_validator(BACKUP_SCHEMA)
+        COMPILED_WIPE_VALIDATOR = get_compiled_validator(WIPE_SCHEMA)
+    except (jsonschema.SchemaError, fastjsonschema.JsonSchemaDefinitionException) as e:
+        raise RuntimeError(f"Invalid schema: {e}")
+    
+    # cert_type -> (compiled validator, jsonschema validator for error details)
+    SCHEMA_VALIDATORS = {
+        "backup": (COMPILED_BACKUP_VALIDATOR, BACKUP_VALIDATOR),
+        "wipe": (COMPILED_WIPE_VALIDATOR, WIPE_VALIDATOR),
+    }
+    VERIFY_RESULT_CACHE.clear()
 
 
 def canonicalize_json(value: Dict[str, Any]) -> bytes:
@@ -113,24 +189,14 @@ def canonicalize_json(value: Dict[str, Any]) -> bytes:
     - Sorted object keys
     - No insignificant whitespace
     - Consistent number formatting
-    """
-    def canonicalize_value(val):
-        if isinstance(val, dict):
-            # Sort keys and canonicalize all values
-            return {k: canonicalize_value(v) for k, v in sorted(val.items())}
-        elif isinstance(val, list):
-            # Canonicalize array elements
-            return [canonicalize_value(item) for item in val]
-        else:
-            # Primitive values are already canonical
-            return val
-    
-    canonical = canonicalize_value(value)
     
-    # Serialize without whitespace for true RFC 8785 compliance
-    canonical_json = json.dumps(canonical, separators=(',', ':'), ensure_ascii=False)
-    
-    return canonical_json.encode('utf-8')
+    orjson sorts keys at every nesting level and formats floats the same way
+    as serde_json (e.g. 1e22, 1e-7), so no Python-level tree walk is needed.
+    Keys sort by code point like the signer's BTreeMap, which differs from
+    JCS's UTF-16 ordering only for keys mixing astral and U+E000+ characters;
+    matching the signer is what makes signatures verify.
+    """
+    return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
 
 
 # Load schemas and public key on startup
@@ -139,14 +205,27 @@ load_public_key()
 
 
 class VerificationResult(BaseModel):
-    """Response model for certificate verification"""
-    schema_valid: bool
+    """
+    Response model for certificate verification
+    
+    cert_summary and computed are plain dicts so constructing a result only
+    checks their type instead of walking their contents; this is cheaper than
+    model_construct(), which assembles the instance in Python.
+    """
+    schema_valid: Optional[bool]  # None when validation was skipped
     signature_valid: Optional[bool] = None
     hash_valid: Optional[bool] = None
     chain_valid: Optional[bool] = None
-    cert_summary: Dict[str, Any]
-    computed: Dict[str, Optional[str]]
+    cert_summary: dict
+    computed: dict  # certificate_json_sha256, linked_backup_sha256
     errors: List[str]
+    # Stable machine-readable codes for the errors above, e.g. HASH_MISMATCH
+    error_codes: List[str] = []
+
+
+class BatchVerificationResult(BaseModel):
+    """Response model for batch certificate verification, in request order"""
+    results: List[VerificationResult]
 
 
 class CertificateSummary(BaseModel):
@@ -158,24 +237,44 @@ class CertificateSummary(BaseModel):
     destination: Optional[str] = None    # For backup certificates
 
 
-def extract_cert_summary(cert_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Extract key fields for certificate summary"""
+def _wipe_summary(cert_data: Dict[str, Any]) -> str:
+    policy = cert_data.get("policy", {})
+    return f"{policy.get('nist_level', 'unknown')} - {policy.get('method', 'unknown')}"
+
+
+def _backup_summary(cert_data: Dict[str, Any]) -> str:
+    destination = cert_data.get("destination", {})
+    if not destination:
+        return "backup"
+    return f"{destination.get('type', 'unknown')} ({destination.get('label', 'unlabeled')})"
+
+
+# cert_type -> builder for the type-specific policy_method_or_destination field
+_SUMMARY_EXTRACTORS = {
+    "wipe": _wipe_summary,
+    "backup": _backup_summary,
+}
+
+
+def extract_cert_summary(cert_data: Dict[str, Any], cert_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract key fields for certificate summary
+    
+    Callers that already looked up cert_type can pass it to skip the lookup.
+    """
+    get = cert_data.get
+    if cert_type is None:
+        cert_type = get("cert_type", "unknown")
     summary = {
-        "cert_id": cert_data.get("cert_id", "unknown"),
-        "cert_type": cert_data.get("cert_type", "unknown"),
-        "device_model": cert_data.get("device", {}).get("model", "unknown"),
+        "cert_id": get("cert_id", "unknown"),
+        "cert_type": cert_type,
+        "device_model": get("device", {}).get("model", "unknown"),
     }
     
     # Add type-specific fields
-    if cert_data.get("cert_type") == "wipe":
-        policy = cert_data.get("policy", {})
-        summary["policy_method_or_destination"] = f"{policy.get('nist_level', 'unknown')} - {policy.get('method', 'unknown')}"
-    elif cert_data.get("cert_type") == "backup":
-        destination = cert_data.get("destination", {})
-        if destination:
-            summary["policy_method_or_destination"] = f"{destination.get('type', 'unknown')} ({destination.get('label', 'unlabeled')})"
-        else:
-            summary["policy_method_or_destination"] = "backup"
+    extractor = _SUMMARY_EXTRACTORS.get(cert_type) if isinstance(cert_type, str) else None
+    if extractor is not None:
+        summary["policy_method_or_destination"] = extractor(cert_data)
     
     return summary
 
@@ -204,19 +303,21 @@ def verify_ed25519_signature(cert_data: Dict[str, Any]) -> Optional[bool]:
         if not sig_b64:
             return False
         
-        signature_bytes = base64.b64decode(sig_b64)
-        
-        # Create unsigned certificate for canonicalization
-        unsigned_cert = cert_data.copy()
-        if "signature" in unsigned_cert:
-            del unsigned_cert["signature"]
+        # Only the signature varies per certificate; the public key was decoded
+        # once into VERIFY_KEY. a2b_base64 is what b64decode calls after
+        # normalising its input.
+        signature_bytes = binascii.a2b_base64(sig_b64)
         
-        # Canonicalize the unsigned certificate
-        canonical_bytes = canonicalize_json(unsigned_cert)
+        # Canonicalize the parsed certificate without its signature. The field
+        # is removed in place and restored, rather than copying the certificate.
+        del cert_data["signature"]
+        try:
+            canonical_bytes = canonicalize_json(cert_data)
+        finally:
+            cert_data["signature"] = signature_obj
         
         # Verify signature using PyNaCl
-        verify_key = VerifyKey(PUBLIC_KEY_BYTES)
-        verify_key.verify(canonical_bytes, signature_bytes)
+        VERIFY_KEY.verify(canonical_bytes, signature_bytes)
         return True
         
     except (BadSignatureError, ValueError, Exception):
@@ -224,7 +325,12 @@ def verify_ed25519_signature(cert_data: Dict[str, Any]) -> Optional[bool]:
 
 
 def compute_certificate_hash(cert_json_bytes: bytes) -> str:
-    """Compute SHA256 hash of certificate JSON bytes"""
+    """
+    Compute SHA256 hash of certificate JSON bytes
+
+    hashlib is backed by OpenSSL, which already selects SHA-NI/ARMv8 SHA
+    instructions at runtime; the digest is lowercase hex.
+    """
     return hashlib.sha256(cert_json_bytes).hexdigest()
 
 
@@ -251,7 +357,7 @@ def validate_chain_linkage(wipe_cert: Dict[str, Any], linked_backup_cert: Option
     return backup_cert_id == linked_cert_id
 
 
-def validate_certificate(cert_data: Dict[str, Any], cert_json_bytes: bytes, linked_backup_cert: Optional[Dict[str, Any]] = None) -> VerificationResult:
+def validate_certificate(cert_data: Dict[str, Any], cert_json_bytes: bytes, linked_backup_cert: Optional[Dict[str, Any]] = None, check_schema: bool = True) -> VerificationResult:
     """
     Validate a certificate against the appropriate schema and verify signature
     
@@ -259,16 +365,22 @@ def validate_certificate(cert_data: Dict[str, Any], cert_json_bytes: bytes, link
         cert_data: The certificate JSON data
         cert_json_bytes: Raw JSON bytes as received
         linked_backup_cert: Optional linked backup certificate for chain validation
+        check_schema: Whether to validate the certificate against its schema;
+            when False schema_valid is None
         
     Returns:
         VerificationResult with validation status and summary
     """
     errors = []
+    error_codes = []
     schema_valid = False
     signature_valid = None
     hash_valid = None
     chain_valid = None
     cert_summary = {}
+    # The reported hash covers the bytes as received, which clients compare
+    # against their stored file. It can't be fused with the signature check:
+    # that hashes the canonical form, and Ed25519 hashes with SHA-512.
     computed = {
         "certificate_json_sha256": compute_certificate_hash(cert_json_bytes),
         "linked_backup_sha256": None
@@ -285,16 +397,14 @@ def validate_certificate(cert_data: Dict[str, Any], cert_json_bytes: bytes, link
                 hash_valid=None,
                 chain_valid=None,
                 errors=errors,
+                error_codes=["MISSING_CERT_TYPE"],
                 cert_summary=cert_summary,
                 computed=computed
             )
         
-        # Select appropriate schema
-        if cert_type == "backup":
-            schema = BACKUP_SCHEMA
-        elif cert_type == "wipe":
-            schema = WIPE_SCHEMA
-        else:
+        # Select appropriate validators
+        validators = SCHEMA_VALIDATORS.get(cert_type) if isinstance(cert_type, str) else None
+        if validators is None:
             errors.append(f"Unknown certificate type: {cert_type}")
             return VerificationResult(
                 schema_valid=False,
@@ -302,26 +412,50 @@ def validate_certificate(cert_data: Dict[str, Any], cert_json_bytes: bytes, link
                 hash_valid=None,
                 chain_valid=None,
                 errors=errors,
+                error_codes=["UNKNOWN_CERT_TYPE"],
                 cert_summary=cert_summary,
                 computed=computed
             )
+        compiled_validator, validator = validators
         
-        # Validate against schema
-        try:
-            validate(instance=cert_data, schema=schema)
-            schema_valid = True
-        except JsonSchemaValidationError as e:
-            errors.append(f"Schema validation error: {e.message}")
-            if hasattr(e, 'path') and e.path:
-                errors.append(f"At path: {' -> '.join(str(p) for p in e.path)}")
+        # Validate against schema. The compiled validator decides; jsonschema is
+        # only walked on rejection to report every error with its path.
+        if check_schema:
+            try:
+                compiled_validator(cert_data)
+                schema_valid = True
+            except fastjsonschema.JsonSchemaValueException as fast_error:
+                error_codes.append("SCHEMA_INVALID")
+                # Report at most MAX_SCHEMA_ERRORS so hostile payloads can't blow
+                # up the error list or the time spent formatting it
+                reported = 0
+                for e in validator.iter_errors(cert_data):
+                    if reported == MAX_SCHEMA_ERRORS:
+                        errors.append("Further schema validation errors omitted")
+                        break
+                    errors.append(f"Schema validation error: {e.message}")
+                    if e.path:
+                        errors.append("At path: " + " -> ".join(map(str, e.path)))
+                    reported += 1
+                if not reported:
+                    errors.append(f"Schema validation error: {fast_error.message}")
+        else:
+            schema_valid = None
         
-        # Verify Ed25519 signature
+        # Verify Ed25519 signature. This deliberately runs after the schema
+        # check rather than beside it on another thread: the compiled schema
+        # check is pure Python and holds the GIL, so only PyNaCl's part could
+        # overlap and the thread handoff costs about as much as it saves.
+        # Requests are parallelised across worker processes and /verify/batch
+        # instead.
         try:
             signature_valid = verify_ed25519_signature(cert_data)
             if signature_valid is False:
                 errors.append("Invalid Ed25519 signature")
+                error_codes.append("INVALID_SIGNATURE")
         except Exception as e:
             signature_valid = False
+            error_codes.append("SIGNATURE_ERROR")
             errors.append(f"Signature verification error: {str(e)}")
         
         # Hash verification for backup certificates
@@ -330,36 +464,49 @@ def validate_certificate(cert_data: Dict[str, Any], cert_json_bytes: bytes, link
             expected_hash = metadata.get("certificate_json_sha256")
             if expected_hash:
                 computed_hash = computed["certificate_json_sha256"]
-                hash_valid = expected_hash.lower() == computed_hash.lower()
+                # Constant-time, so response timing says nothing about how
+                # much of a guessed hash matched
+                hash_valid = hmac.compare_digest(expected_hash.lower().encode(), computed_hash.encode())
                 if not hash_valid:
+                    error_codes.append("HASH_MISMATCH")
                     errors.append(f"Certificate hash mismatch: expected {expected_hash}, got {computed_hash}")
         
         # Chain linkage validation for wipe certificates
         if cert_type == "wipe" and linked_backup_cert:
             try:
                 # Validate linked backup cert against backup schema
-                validate(instance=linked_backup_cert, schema=BACKUP_SCHEMA)
+                COMPILED_BACKUP_VALIDATOR(linked_backup_cert)
                 
-                # Compute linked backup hash
-                linked_backup_bytes = json.dumps(linked_backup_cert, separators=(',', ':')).encode('utf-8')
+                # Compute linked backup hash over its canonical form
+                linked_backup_bytes = orjson.dumps(linked_backup_cert, option=orjson.OPT_SORT_KEYS)
                 computed["linked_backup_sha256"] = compute_certificate_hash(linked_backup_bytes)
                 
                 # Validate linkage
                 chain_valid = validate_chain_linkage(cert_data, linked_backup_cert)
                 if chain_valid is False:
+                    error_codes.append("LINKAGE_MISMATCH")
                     errors.append("Chain linkage validation failed: backup_cert_id mismatch")
                 
-            except JsonSchemaValidationError as e:
+            except fastjsonschema.JsonSchemaValueException as e:
                 chain_valid = False
-                errors.append(f"Linked backup certificate schema error: {e.message}")
+                # Describe the failure with the cached backup validator, as for
+                # the main certificate. Only one error is reported, so pick the
+                # most relevant of the first few rather than whichever came first.
+                detail = jsonschema.exceptions.best_match(
+                    islice(BACKUP_VALIDATOR.iter_errors(linked_backup_cert), MAX_SCHEMA_ERRORS)
+                ) or e
+                error_codes.append("LINKED_BACKUP_SCHEMA_INVALID")
+                errors.append(f"Linked backup certificate schema error: {detail.message}")
             except Exception as e:
                 chain_valid = False
+                error_codes.append("CHAIN_ERROR")
                 errors.append(f"Chain validation error: {str(e)}")
         
         # Extract summary (even if validation failed, try to get what we can)
-        cert_summary = extract_cert_summary(cert_data)
+        cert_summary = extract_cert_summary(cert_data, cert_type)
         
     except Exception as e:
+        error_codes.append("INTERNAL_ERROR")
         errors.append(f"Unexpected error during validation: {str(e)}")
     
     return VerificationResult(
@@ -368,15 +515,49 @@ def validate_certificate(cert_data: Dict[str, Any], cert_json_bytes: bytes, link
         hash_valid=hash_valid,
         chain_valid=chain_valid,
         errors=errors,
+        error_codes=error_codes,
         cert_summary=cert_summary,
         computed=computed
     )
 
 
-@app.get("/", response_class=HTMLResponse)
-async def get_home():
-    """Provide minimal HTML page showing how to POST"""
-    html_content = """
+def summarize_certificate(cert_data: Dict[str, Any], cert_json_bytes: bytes) -> VerificationResult:
+    """
+    Summarize a certificate without schema, signature, hash or chain checks
+    
+    All validity fields are None since nothing was verified.
+    """
+    errors = []
+    error_codes = []
+    cert_summary = {}
+    try:
+        cert_summary = extract_cert_summary(cert_data)
+    except Exception as e:
+        error_codes.append("INTERNAL_ERROR")
+        errors.append(f"Unexpected error during summary extraction: {str(e)}")
+    
+    return VerificationResult(
+        schema_valid=None,
+        signature_valid=None,
+        hash_valid=None,
+        chain_valid=None,
+        errors=errors,
+        error_codes=error_codes,
+        cert_summary=cert_summary,
+        computed={
+            "certificate_json_sha256": compute_certificate_hash(cert_json_bytes),
+            "linked_backup_sha256": None
+        }
+    )
+
+
+def make_etag(content: bytes, suffix: str = "") -> str:
+    """Build a strong ETag from a SHA-256 prefix of the content"""
+    return f'"{hashlib.sha256(content).hexdigest()[:16]}{suffix}"'
+
+
+# Static landing page, encoded once at import instead of on every request
+HOME_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -428,7 +609,8 @@ async def get_home():
     "certificate_json_sha256": "a1b2c3...",
     "linked_backup_sha256": null
   },
-  "errors": []
+  "errors": [],
+  "error_codes": []
 }</pre>
                 </div>
                 
@@ -478,11 +660,89 @@ curl -X POST "http://localhost:8000/verify" \\
     </body>
     </html>
     """
-    return HTMLResponse(content=html_content)
+HOME_HTML_BYTES = HOME_HTML.encode("utf-8")
+HOME_HTML_GZ = gzip.compress(HOME_HTML_BYTES, compresslevel=9, mtime=0)
+HOME_HTML_ETAG = make_etag(HOME_HTML_BYTES)
+HOME_HTML_GZ_ETAG = make_etag(HOME_HTML_BYTES, "-gzip")
 
 
-@app.post("/verify", response_model=VerificationResult)
-async def verify_certificate(request: Request):
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the client's If-None-Match header already covers an ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a gzip response
+    
+    An explicit gzip (or x-gzip) entry decides by its q-value, so "gzip;q=0"
+    refuses it; otherwise a "*" entry with a nonzero q-value allows it.
+    """
+    wildcard = False
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            wildcard = q > 0
+    return wildcard
+
+
+@app.get("/", response_class=HTMLResponse)
+async def get_home(request: Request):
+    """Provide minimal HTML page showing how to POST"""
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        content, etag = HOME_HTML_GZ, HOME_HTML_GZ_ETAG
+        headers = {"ETag": etag, "Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+    else:
+        content, etag = HOME_HTML_BYTES, HOME_HTML_ETAG
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+    return HTMLResponse(content=content, headers=headers)
+
+
+async def read_body_limited(request: Request) -> bytes:
+    """Read the request body, rejecting it with 413 as soon as it exceeds MAX_BODY_BYTES"""
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Request body exceeds {MAX_BODY_BYTES} bytes"
+    )
+    
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_BODY_BYTES:
+        raise too_large
+    
+    # Content-Length may be absent (chunked) or wrong, so enforce while streaming.
+    # The stream ends with an empty chunk; leaving it out means a body that
+    # arrived in one piece is returned by join() as-is instead of copied.
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        if not chunk:
+            continue
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@app.post("/verify", response_model=VerificationResult, response_class=ORJSONResponse)
+async def verify_certificate(request: Request, check: Literal["full", "signature", "summary-only"] = "full"):
     """
     Verify a JSON certificate against the appropriate schema with Ed25519 signature verification
     
@@ -492,33 +752,55 @@ async def verify_certificate(request: Request):
     
     For wipe certificates, include 'linked_backup_cert' in the JSON body to enable
     chain linkage validation.
+    
+    Pass ?check=signature to skip schema validation when only signature, hash
+    and chain validity are needed, or ?check=summary-only to skip all
+    verification and only return the certificate summary and body hash.
     """
     try:
         # Get raw JSON body
-        body = await request.body()
+        body = await read_body_limited(request)
         if not body:
             raise HTTPException(status_code=400, detail="Empty request body")
         
-        # Parse JSON
+        cache_key = (hashlib.sha256(body).digest(), check)
+        cached = VERIFY_RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
+        # Parse JSON straight from the raw bytes
         try:
-            request_data = json.loads(body.decode('utf-8'))
-        except json.JSONDecodeError as e:
+            request_data = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
             raise HTTPException(
                 status_code=400, 
                 detail=f"Invalid JSON: {str(e)}"
             )
         
-        # Extract main certificate and optional linked backup
-        cert_data = request_data.copy()
+        # Extract main certificate and optional linked backup. The parsed body
+        # is private to this request, so it is used without copying.
+        cert_data = request_data
         linked_backup_cert = None
         
         # Handle linked backup certificate for wipe certs
         if "linked_backup_cert" in cert_data:
             linked_backup_cert = cert_data.pop("linked_backup_cert")
         
-        # Validate certificate (pass original body bytes for hash computation)
-        result = validate_certificate(cert_data, body, linked_backup_cert)
-        return result
+        if check == "summary-only":
+            result = summarize_certificate(cert_data, body)
+        else:
+            # Validate certificate (pass original body bytes for hash computation)
+            result = validate_certificate(
+                cert_data, body, linked_backup_cert, check_schema=check == "full"
+            )
+        
+        # Returning a response directly skips FastAPI re-validating the model;
+        # response_model is kept for the OpenAPI schema
+        content = orjson.dumps(result.model_dump())
+        # Internal errors may be transient, so they are never replayed
+        if "INTERNAL_ERROR" not in result.error_codes:
+            VERIFY_RESULT_CACHE.put(cache_key, content)
+        return Response(content=content, media_type="application/json")
         
     except HTTPException:
         raise
@@ -529,6 +811,69 @@ async def verify_certificate(request: Request):
         )
 
 
+def verify_batch_item(request_data: Any) -> VerificationResult:
+    """Verify one entry of a /verify/batch request"""
+    if not isinstance(request_data, dict):
+        return VerificationResult(
+            schema_valid=False,
+            signature_valid=None,
+            hash_valid=None,
+            chain_valid=None,
+            errors=["Certificate must be a JSON object"],
+            error_codes=["NOT_AN_OBJECT"],
+            cert_summary={},
+            computed={"certificate_json_sha256": None, "linked_backup_sha256": None}
+        )
+    
+    # The raw bytes of each entry aren't available, so hash its compact encoding
+    # in the order it was sent, linked backup included, which matches a compact
+    # single /verify body. hashlib releases the GIL for inputs over 2 KiB, so
+    # entries on different executor threads are hashed in parallel.
+    cert_json_bytes = orjson.dumps(request_data)
+    cert_data = request_data.copy()
+    linked_backup_cert = cert_data.pop("linked_backup_cert", None)
+    return validate_certificate(cert_data, cert_json_bytes, linked_backup_cert)
+
+
+@app.post("/verify/batch", response_model=BatchVerificationResult, response_class=ORJSONResponse)
+async def verify_certificate_batch(request: Request):
+    """
+    Verify several certificates in one request
+    
+    Accepts {"certs": [...]} where each entry is a certificate as POSTed to
+    /verify (optionally with 'linked_backup_cert'). Certificates are verified
+    concurrently and results are returned in the same order.
+    """
+    body = await read_body_limited(request)
+    if not body:
+        raise HTTPException(status_code=400, detail="Empty request body")
+    
+    try:
+        request_data = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+    
+    certs = request_data.get("certs") if isinstance(request_data, dict) else None
+    if not isinstance(certs, list):
+        raise HTTPException(status_code=400, detail="Request body must be an object with a 'certs' list")
+    if len(certs) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_SIZE} certificates")
+    
+    try:
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(BATCH_VERIFY_EXECUTOR, verify_batch_item, cert)
+            for cert in certs
+        ))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+    
+    return ORJSONResponse({"results": [result.model_dump() for result in results]})
+
+
 @app.get("/verify/{cert_id}")
 async def get_certificate_info(cert_id: str):
     """
@@ -544,17 +889,36 @@ async def get_certificate_info(cert_id: str):
     }
 
 
+# Health only reflects state loaded at import, so its body and ETag are fixed
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "schemas_loaded": BACKUP_SCHEMA is not None and WIPE_SCHEMA is not None,
+    "public_key_loaded": PUBLIC_KEY_BYTES is not None,
+    "version": "1.0.0"
+})
+HEALTH_ETAG = make_etag(HEALTH_BODY)
+
+
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "schemas_loaded": BACKUP_SCHEMA is not None and WIPE_SCHEMA is not None,
-        "public_key_loaded": PUBLIC_KEY_BYTES is not None,
-        "version": "1.0.0"
-    }
+    if etag_matches(request, HEALTH_ETAG):
+        return Response(status_code=304, headers={"ETag": HEALTH_ETAG})
+    return Response(content=HEALTH_BODY, media_type="application/json", headers={"ETag": HEALTH_ETAG})
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    
+    # Validation and signature checks are CPU-bound, so scale with processes;
+    # uvloop and httptools both ship with uvicorn[standard]
+    workers = int(os.environ.get("UVICORN_WORKERS", os.cpu_count() or 1))
+    uvicorn.run(
+        "app.main:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        app_dir=str(Path(__file__).parent.parent)
+    )
@@ -0,0 +1,50 @@
+"""
+Verification result cache
+
+Rendered /verify responses are kept in an LRU keyed by the body digest and
+check mode. Responses can echo client-supplied strings (an unknown cert_type,
+an expected hash, schema error messages), so the cache is bounded by total
+bytes as well as entry count, and oversized responses are not cached at all.
+Otherwise a stream of large junk bodies could pin gigabytes per worker.
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class ResultCache:
+    """LRU of response bodies bounded by entry count and total size"""
+
+    def __init__(self, max_entries: int, max_bytes: int, max_entry_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached body for key, marking it most recently used"""
+        content = self._entries.get(key)
+        if content is not None:
+            self._entries.move_to_end(key)
+        return content
+
+    def put(self, key: Hashable, content: bytes) -> None:
+        """Cache content under key unless it is larger than one entry may be"""
+        if len(content) > self.max_entry_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= len(previous)
+        self._entries[key] = content
+        self.total_bytes += len(content)
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total_bytes = 0
@@ -0,0 +1,102 @@
+"""
+Schema validator cache
+
+Compiling a JSON schema is far more expensive than validating against it, so
+validators are built once per distinct schema and reused. Schemas are keyed by
+their key-sorted JSON serialization, which makes equal schemas share a
+validator regardless of key order or object identity.
+
+Setting SECUREWIPE_VALIDATOR_CACHE_DIR also persists the fastjsonschema
+generated code there as importable modules. Python's bytecode cache then lets
+later processes load a validator in about a millisecond instead of compiling
+the schema again, which dominates cold start. The directory must be as
+trusted as the application code, since its modules are executed.
+"""
+
+import hashlib
+import importlib.util
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import fastjsonschema
+import jsonschema
+import orjson
+
+# Upper bound on distinct cached schemas, so unbounded schema variety can't
+# grow the cache without limit
+VALIDATOR_CACHE_SIZE = 128
+
+# Options every compiled validator is built with. Defaults are not injected so
+# the certificate is never mutated before its signature is checked, and formats
+# are not asserted to match jsonschema. detailed_exceptions=False would be
+# cheaper still, but fastjsonschema 2.22 fails to generate code for "const"
+# with it, which both certificate schemas use.
+_COMPILE_OPTIONS = {"use_default": False, "use_formats": False}
+
+
+def schema_cache_key(schema: Dict[str, Any]) -> bytes:
+    """Return a stable cache key for a schema"""
+    return orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+
+
+@lru_cache(maxsize=VALIDATOR_CACHE_SIZE)
+def _validator_for_key(key: bytes):
+    schema = orjson.loads(key)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+def _load_code_cache(key: bytes, cache_dir: Path) -> Callable[[Any], Any]:
+    # Generated code depends on the fastjsonschema version and compile options
+    # as well as the schema, so all of them go into the module name
+    digest = hashlib.sha256(
+        f"{fastjsonschema.VERSION}\0{sorted(_COMPILE_OPTIONS.items())}\0".encode() + key
+    ).hexdigest()
+    module_name = f"schema_validator_{digest[:32]}"
+    path = cache_dir / f"{module_name}.py"
+    
+    if not path.exists():
+        code = fastjsonschema.compile_to_code(orjson.loads(key), **_COMPILE_OPTIONS)
+        # The first generated function validates the root of the schema
+        root = re.search(r"^def (\w+)\(", code, re.MULTILINE).group(1)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(f"{code}\n\nvalidate = {root}\n")
+        os.replace(tmp_path, path)
+    
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.validate
+
+
+@lru_cache(maxsize=VALIDATOR_CACHE_SIZE)
+def _compiled_validator_for_key(key: bytes) -> Callable[[Any], Any]:
+    cache_dir = os.environ.get("SECUREWIPE_VALIDATOR_CACHE_DIR")
+    if cache_dir:
+        return _load_code_cache(key, Path(cache_dir))
+    return fastjsonschema.compile(orjson.loads(key), **_COMPILE_OPTIONS)
+
+
+def get_validator(schema: Dict[str, Any]):
+    """
+    Get a checked jsonschema validator instance for a schema
+
+    Raises:
+        jsonschema.SchemaError: If the schema itself is invalid
+    """
+    return _validator_for_key(schema_cache_key(schema))
+
+
+def get_compiled_validator(schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """
+    Get a fastjsonschema-compiled validation function for a schema
+
+    Raises:
+        fastjsonschema.JsonSchemaDefinitionException: If the schema is invalid
+    """
+    return _compiled_validator_for_key(schema_cache_key(schema))
@@ -4,11 +4,144 @@ SecureWipe Portal Demo
 Shows Ed25519 signature verification, hash recomputation, and chain linkage validation
 """
 
+import hashlib
 import json
 import sys
+import orjson
 from fastapi.testclient import TestClient
 from app.main import app
 
+# Demo certificates, built once at import
+VALID_BACKUP = {
+    "cert_type": "backup",
+    "cert_id": "demo_backup_001",
+    "certificate_version": "v1.0.0",
+    "created_at": "2023-12-05T14:30:22.123456Z",
+    "issuer": {
+        "organization": "SecureWipe (SIH)",
+        "tool_name": "securewipe",
+        "tool_version": "v1.0.0"
+    },
+    "device": {
+        "model": "Samsung SSD 980 PRO 1TB",
+        "serial": "S6DC9NL0T12345A",
+        "bus": "SATA",
+        "capacity_bytes": 1000204886016
+    },
+    "files_summary": {
+        "count": 1543,
+        "personal_bytes": 4567890123,
+        "included_paths": ["/home/user"]
+    },
+    "destination": {
+        "type": "usb",
+        "label": "External Drive",
+        "fs": "exfat"
+    },
+    "crypto": {
+        "alg": "AES-256-CTR",
+        "manifest_sha256": "a1b2c3d4e5f67890123456789012345678901234567890123456789012345678",
+        "key_management": "ephemeral_session_key"
+    },
+    "verification": {
+        "strategy": "sampled_files",
+        "samples": 100,
+        "coverage": {"mode": "percent", "percent": 15.0},
+        "failures": 0
+    },
+    "policy": {
+        "name": "NIST SP 800-88 Rev.1",
+        "version": "2023.12"
+    },
+    "result": "PASS",
+    "environment": {
+        "operator": "admin",
+        "os_kernel": "Linux 6.8.0-35-generic",
+        "tool_version": "v1.0.0",
+        "device_firmware": "test",
+        "containerized": False
+    },
+    "exceptions": {
+        "items": [],
+        "text": "None"
+    },
+    "metadata": {
+        "certificate_json_sha256": "a1b2c3d4e5f67890123456789012345678901234567890123456789012345678"
+    },
+    "signature": {
+        "alg": "Ed25519",
+        "sig": "dGVzdF9zaWduYXR1cmVfZGF0YQ==",
+        "pubkey_id": "sih_root_v1",
+        "canonicalization": "RFC8785_JSON"
+    }
+}
+
+WIPE_CERT = {
+    "cert_type": "wipe",
+    "cert_id": "demo_wipe_001",
+    "certificate_version": "v1.0.0",
+    "created_at": "2023-12-05T15:00:30.654321Z",
+    "issuer": {
+        "organization": "SecureWipe (SIH)",
+        "tool_name": "securewipe",
+        "tool_version": "v1.0.0"
+    },
+    "device": {
+        "model": "Samsung SSD 980 PRO 1TB",
+        "serial": "S6DC9NL0T12345A",
+        "bus": "SATA",
+        "capacity_bytes": 1000204886016
+    },
+    "policy": {
+        "nist_level": "PURGE",
+        "method": "nvme_sanitize_crypto_erase"
+    },
+    "commands": [
+        {
+            "cmd": "nvme sanitize /dev/nvme0n1 --sanitize-action=2",
+            "exit": 0,
+            "ms": 45000
+        }
+    ],
+    "verify": {
+        "strategy": "controller_status",
+        "samples": 100,
+        "coverage": {"mode": "samples", "samples": 100},
+        "failures": 0,
+        "result": "PASS"
+    },
+    "result": "PASS",
+    "environment": {
+        "operator": "admin",
+        "os_kernel": "Linux 6.8.0-35-generic",
+        "tool_version": "v1.0.0",
+        "device_firmware": "test",
+        "containerized": False
+    },
+    "evidence": {
+        "smart_snapshot_sha256": "a1b2c3d4e5f67890123456789012345678901234567890123456789012345678",
+        "logs_sha256": "b2c3d4e5f6789012345678901234567890123456789012345678901234567890"
+    },
+    "linkage": {
+        "backup_cert_id": "demo_backup_001"  # Links to the backup cert above
+    },
+    "exceptions": {
+        "items": [],
+        "text": "None"
+    },
+    "metadata": {
+        "certificate_json_sha256": "f6789012345678901234567890123456789012345678901234567890abcdef12"
+    },
+    "signature": {
+        "alg": "Ed25519",
+        "sig": "dGVzdF93aXBlX3NpZ25hdHVyZQ==",
+        "pubkey_id": "sih_root_v1",
+        "canonicalization": "RFC8785_JSON"
+    },
+    "linked_backup_cert": VALID_BACKUP
+}
+
+
 def demo_verification():
     """Demonstrate the verification portal functionality"""
     client = TestClient(app)
@@ -26,71 +159,10 @@ def demo_verification():
     
     # Test 2: Valid backup certificate (schema validation)
     print("\n2️⃣  Schema Validation - Valid Backup Certificate")
-    valid_backup = {
-        "cert_type": "backup",
-        "cert_id": "demo_backup_001",
-        "certificate_version": "v1.0.0",
-        "created_at": "2023-12-05T14:30:22.123456Z",
-        "issuer": {
-            "organization": "SecureWipe (SIH)",
-            "tool_name": "securewipe",
-            "tool_version": "v1.0.0"
-        },
-        "device": {
-            "model": "Samsung SSD 980 PRO 1TB",
-            "serial": "S6DC9NL0T12345A",
-            "bus": "SATA",
-            "capacity_bytes": 1000204886016
-        },
-        "files_summary": {
-            "count": 1543,
-            "personal_bytes": 4567890123,
-            "included_paths": ["/home/user"]
-        },
-        "destination": {
-            "type": "usb",
-            "label": "External Drive",
-            "fs": "exfat"
-        },
-        "crypto": {
-            "alg": "AES-256-CTR",
-            "manifest_sha256": "a1b2c3d4e5f67890123456789012345678901234567890123456789012345678",
-            "key_management": "ephemeral_session_key"
-        },
-        "verification": {
-            "strategy": "sampled_files",
-            "samples": 100,
-            "coverage": {"mode": "percent", "percent": 15.0},
-            "failures": 0
-        },
-        "policy": {
-            "name": "NIST SP 800-88 Rev.1",
-            "version": "2023.12"
-        },
-        "result": "PASS",
-        "environment": {
-            "operator": "admin",
-            "os_kernel": "Linux 6.8.0-35-generic",
-            "tool_version": "v1.0.0",
-            "device_firmware": "test",
-            "containerized": False
-        },
-        "exceptions": {
-            "items": [],
-            "text": "None"
-        },
-        "metadata": {
-            "certificate_json_sha256": "a1b2c3d4e5f67890123456789012345678901234567890123456789012345678"
-        },
-        "signature": {
-            "alg": "Ed25519",
-            "sig": "dGVzdF9zaWduYXR1cmVfZGF0YQ==",
-            "pubkey_id": "sih_root_v1",
-            "canonicalization": "RFC8785_JSON"
-        }
-    }
-    
-    response = client.post("/verify", json=valid_backup)
+    # The portal hashes the exact bytes it receives, so serialize once and
+    # hash the same bytes locally
+    body = orjson.dumps(VALID_BACKUP)
+    response = client.post("/verify", content=body, headers={"Content-Type": "application/json"})
     result = response.json()
     
     print(f"   ✅ Schema Valid: {result['schema_valid']}")
@@ -98,10 +170,11 @@ def demo_verification():
     print(f"   🧮 Hash Valid: {result['hash_valid']}")
     print(f"   📋 Certificate ID: {result['cert_summary']['cert_id']}")
     print(f"   📊 Computed Hash: {result['computed']['certificate_json_sha256'][:16]}...")
+    print(f"   🔁 Matches Local Hash: {result['computed']['certificate_json_sha256'] == hashlib.sha256(body).hexdigest()}")
     
     # Test 3: Invalid signature
     print("\n3️⃣  Signature Verification - Invalid Signature")
-    tampered_cert = valid_backup.copy()
+    tampered_cert = VALID_BACKUP.copy()
     tampered_cert["cert_id"] = "tampered_certificate"  # This will make signature invalid
     
     response = client.post("/verify", json=tampered_cert)
@@ -113,72 +186,7 @@ def demo_verification():
     
     # Test 4: Chain linkage validation
     print("\n4️⃣  Chain Linkage Validation")
-    wipe_cert = {
-        "cert_type": "wipe",
-        "cert_id": "demo_wipe_001",
-        "certificate_version": "v1.0.0",
-        "created_at": "2023-12-05T15:00:30.654321Z",
-        "issuer": {
-            "organization": "SecureWipe (SIH)",
-            "tool_name": "securewipe",
-            "tool_version": "v1.0.0"
-        },
-        "device": {
-            "model": "Samsung SSD 980 PRO 1TB",
-            "serial": "S6DC9NL0T12345A",
-            "bus": "SATA",
-            "capacity_bytes": 1000204886016
-        },
-        "policy": {
-            "nist_level": "PURGE",
-            "method": "nvme_sanitize_crypto_erase"
-        },
-        "commands": [
-            {
-                "cmd": "nvme sanitize /dev/nvme0n1 --sanitize-action=2",
-                "exit": 0,
-                "ms": 45000
-            }
-        ],
-        "verify": {
-            "strategy": "controller_status",
-            "samples": 100,
-            "coverage": {"mode": "samples", "samples": 100},
-            "failures": 0,
-            "result": "PASS"
-        },
-        "result": "PASS",
-        "environment": {
-            "operator": "admin",
-            "os_kernel": "Linux 6.8.0-35-generic",
-            "tool_version": "v1.0.0",
-            "device_firmware": "test",
-            "containerized": False
-        },
-        "evidence": {
-            "smart_snapshot_sha256": "a1b2c3d4e5f67890123456789012345678901234567890123456789012345678",
-            "logs_sha256": "b2c3d4e5f6789012345678901234567890123456789012345678901234567890"
-        },
-        "linkage": {
-            "backup_cert_id": "demo_backup_001"  # Links to the backup cert above
-        },
-        "exceptions": {
-            "items": [],
-            "text": "None"
-        },
-        "metadata": {
-            "certificate_json_sha256": "f6789012345678901234567890123456789012345678901234567890abcdef12"
-        },
-        "signature": {
-            "alg": "Ed25519",
-            "sig": "dGVzdF93aXBlX3NpZ25hdHVyZQ==",
-            "pubkey_id": "sih_root_v1",
-            "canonicalization": "RFC8785_JSON"
-        },
-        "linked_backup_cert": valid_backup
-    }
-    
-    response = client.post("/verify", json=wipe_cert)
+    response = client.post("/verify", json=WIPE_CERT)
     result = response.json()
     
     print(f"   ✅ Schema Valid: {result['schema_valid']}")
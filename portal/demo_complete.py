@@ -8,14 +8,175 @@ This script demonstrates all the implemented verification features:
 2. SHA256 hash recomputation and validation  
 3. Chain linkage validation between wipe and backup certificates
 4. JSON schema validation
-5. Complete API integration testing
+5. Batch verification of many certificates per request
+6. Complete API integration testing
 """
 
-import json
+import asyncio
 import hashlib
-import requests
+import sys
+import time
+import httpx
+import orjson
 from typing import Dict, Any
 
+# Demo certificates. Schema validation test: missing required fields
+INVALID_CERT = {
+    "cert_type": "backup",
+    "cert_id": "test_001"
+    # Missing many required fields
+}
+
+# Signature verification test: well-formed but with an invalid signature
+CERT_WITH_SIG = {
+    "cert_type": "backup",
+    "cert_id": "sig_test_001",
+    "certificate_version": "v1.0.0",
+    "created_at": "2023-01-01T00:00:00Z",
+    "device": {
+        "model": "Test SSD",
+        "serial": "SIG123",
+        "bus": "SATA", 
+        "capacity_bytes": 1000000000
+    },
+    "files_summary": {
+        "count": 10,
+        "personal_bytes": 1000000,
+        "included_paths": ["/test"]
+    },
+    "destination": {
+        "type": "usb",
+        "label": "Test Drive",
+        "fs": "exfat"
+    },
+    "crypto": {
+        "alg": "AES-256-CTR",
+        "manifest_sha256": "a" * 64,
+        "key_management": "ephemeral_session_key"
+    },
+    "verification": {
+        "strategy": "sampled_files",
+        "samples": 5,
+        "coverage": {"mode": "percent", "percent": 10.0},
+        "failures": 0
+    },
+    "policy": {
+        "name": "NIST SP 800-88 Rev.1",
+        "version": "2023.12"
+    },
+    "result": "PASS",
+    "environment": {
+        "operator": "test",
+        "os_kernel": "Linux 5.4.0",
+        "tool_version": "v1.0.0",
+        "device_firmware": "test",
+        "containerized": False
+    },
+    "exceptions": {
+        "items": [],
+        "text": "None"
+    },
+    "metadata": {
+        "certificate_json_sha256": "invalid_hash_here"
+    },
+    "issuer": {
+        "organization": "SecureWipe (SIH)",
+        "tool_name": "securewipe",
+        "tool_version": "v1.0.0"
+    },
+    "signature": {
+        "alg": "Ed25519", 
+        "sig": "invalid_signature_base64",
+        "pubkey_id": "sih_root_v1",
+        "canonicalization": "RFC8785_JSON"
+    }
+}
+
+# Hash computation demo
+SIMPLE_CERT = {"cert_type": "backup", "cert_id": "hash_demo"}
+
+# Backup cert for the chain linkage demo
+BACKUP_CERT = {
+    "cert_type": "backup",
+    "cert_id": "chain_backup_001",
+    # ... other required fields would go here
+}
+
+# Wipe cert with linkage
+WIPE_CERT = {
+    "cert_type": "wipe", 
+    "cert_id": "chain_wipe_001",
+    "linkage": {
+        "backup_cert_id": "chain_backup_001"  # Links to backup
+    },
+    "linked_backup_cert": BACKUP_CERT,  # Include backup for validation
+    # ... other required fields would go here
+}
+
+# Request bodies serialized once up front. The compact bytes posted are
+# exactly what the portal hashes, so the hash demo can compare against them.
+JSON_HEADERS = {"Content-Type": "application/json"}
+FIXTURES = {
+    "invalid": orjson.dumps(INVALID_CERT),
+    "sig": orjson.dumps(CERT_WITH_SIG),
+    "simple": orjson.dumps(SIMPLE_CERT),
+    "wipe": orjson.dumps(WIPE_CERT),
+}
+# Hashes of the fixture bodies, computed with them; the portal should report
+# the same value in computed.certificate_json_sha256
+FIXTURE_HASHES = {name: hashlib.sha256(body).hexdigest() for name, body in FIXTURES.items()}
+
+
+# Requests the demo has in flight at once after the health check
+DEMO_CONCURRENCY = 5
+
+
+async def run_demo_requests(base_url: str):
+    """
+    Send every demo request over one keep-alive client
+    
+    The requests are independent, so after the health check they are sent
+    concurrently; the wall time is roughly the slowest request, not the sum.
+    uvicorn only speaks HTTP/1.1, so rather than multiplexing over HTTP/2 the
+    client opens one pooled keep-alive connection per in-flight request.
+    Returns None if the health check fails.
+    """
+    limits = httpx.Limits(max_connections=DEMO_CONCURRENCY, max_keepalive_connections=DEMO_CONCURRENCY)
+    async with httpx.AsyncClient(base_url=base_url, headers=JSON_HEADERS, limits=limits) as client:
+        # Test 1: Health Check
+        print("\n🏥 Health Check")
+        try:
+            response = await client.get("/health")
+            health = response.json()
+            status, schemas_loaded, public_key_loaded = (
+                health["status"], health["schemas_loaded"], health["public_key_loaded"]
+            )
+            print(f"   Status: {status}")
+            print(f"   Schemas Loaded: {schemas_loaded}")
+            print(f"   Public Key Loaded: {public_key_loaded}")
+        except Exception as e:
+            print(f"   ❌ Health check failed: {e}")
+            return None
+        
+        batch_size = 50
+        batch_body = orjson.dumps({"certs": [
+            {**CERT_WITH_SIG, "cert_id": f"batch_test_{i:03d}"}
+            for i in range(batch_size)
+        ]})
+        
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            client.post("/verify", content=FIXTURES["invalid"]),
+            client.post("/verify", content=FIXTURES["sig"]),
+            client.post("/verify", content=FIXTURES["simple"]),
+            client.post("/verify", content=FIXTURES["wipe"]),
+            client.post("/verify/batch", content=batch_body),
+        )
+        elapsed = time.perf_counter() - start
+    
+    return [response.json() for response in responses], elapsed
+
+
 def test_portal_verification():
     """Test all portal verification features"""
     base_url = "http://localhost:8000"
@@ -23,155 +184,64 @@ def test_portal_verification():
     print("🔒 SecureWipe Portal Verification Demo")
     print("=" * 45)
     
-    # Test 1: Health Check
-    print("\n🏥 Health Check")
-    try:
-        response = requests.get(f"{base_url}/health")
-        health = response.json()
-        print(f"   Status: {health['status']}")
-        print(f"   Schemas Loaded: {health['schemas_loaded']}")
-        print(f"   Public Key Loaded: {health['public_key_loaded']}")
-    except Exception as e:
-        print(f"   ❌ Health check failed: {e}")
+    demo_results = asyncio.run(run_demo_requests(base_url))
+    if demo_results is None:
         return
+    (invalid_result, sig_result, simple_result, wipe_result, batch_result), elapsed = demo_results
     
-    # Test 2: Schema Validation (Missing Required Fields)
-    print("\n📋 Schema Validation Test")
-    invalid_cert = {
-        "cert_type": "backup",
-        "cert_id": "test_001"
-        # Missing many required fields
-    }
+    # Results are collected and written in one go rather than one print() each
+    out = []
     
-    response = requests.post(f"{base_url}/verify", json=invalid_cert)
-    result = response.json()
-    print(f"   Schema Valid: {result.get('schema_valid', False)}")
-    print(f"   Error Count: {len(result.get('errors', []))}")
+    # Test 2: Schema Validation (Missing Required Fields)
+    out.append("\n📋 Schema Validation Test")
+    result = invalid_result
+    out.append(f"   Schema Valid: {result.get('schema_valid', False)}")
+    out.append(f"   Error Count: {len(result.get('errors', []))}")
     if result.get('errors'):
-        print(f"   First Error: {result['errors'][0]}")
+        out.append(f"   First Error: {result['errors'][0]}")
     
     # Test 3: Signature Verification (Invalid Signature)
-    print("\n🔐 Signature Verification Test")
-    cert_with_sig = {
-        "cert_type": "backup",
-        "cert_id": "sig_test_001",
-        "certificate_version": "v1.0.0",
-        "created_at": "2023-01-01T00:00:00Z",
-        "device": {
-            "model": "Test SSD",
-            "serial": "SIG123",
-            "bus": "SATA", 
-            "capacity_bytes": 1000000000
-        },
-        "files_summary": {
-            "count": 10,
-            "personal_bytes": 1000000,
-            "included_paths": ["/test"]
-        },
-        "destination": {
-            "type": "usb",
-            "label": "Test Drive",
-            "fs": "exfat"
-        },
-        "crypto": {
-            "alg": "AES-256-CTR",
-            "manifest_sha256": "a" * 64,
-            "key_management": "ephemeral_session_key"
-        },
-        "verification": {
-            "strategy": "sampled_files",
-            "samples": 5,
-            "coverage": {"mode": "percent", "percent": 10.0},
-            "failures": 0
-        },
-        "policy": {
-            "name": "NIST SP 800-88 Rev.1",
-            "version": "2023.12"
-        },
-        "result": "PASS",
-        "environment": {
-            "operator": "test",
-            "os_kernel": "Linux 5.4.0",
-            "tool_version": "v1.0.0",
-            "device_firmware": "test",
-            "containerized": False
-        },
-        "exceptions": {
-            "items": [],
-            "text": "None"
-        },
-        "metadata": {
-            "certificate_json_sha256": "invalid_hash_here"
-        },
-        "issuer": {
-            "organization": "SecureWipe (SIH)",
-            "tool_name": "securewipe",
-            "tool_version": "v1.0.0"
-        },
-        "signature": {
-            "alg": "Ed25519", 
-            "sig": "invalid_signature_base64",
-            "pubkey_id": "sih_root_v1",
-            "canonicalization": "RFC8785_JSON"
-        }
-    }
-    
-    response = requests.post(f"{base_url}/verify", json=cert_with_sig)
-    result = response.json()
-    print(f"   Schema Valid: {result.get('schema_valid', False)}")
-    print(f"   Signature Valid: {result.get('signature_valid', False)}")
-    print(f"   Hash Valid: {result.get('hash_valid', False)}")
+    out.append("\n🔐 Signature Verification Test")
+    result = sig_result
+    out.append(f"   Schema Valid: {result.get('schema_valid', False)}")
+    out.append(f"   Signature Valid: {result.get('signature_valid', False)}")
+    out.append(f"   Hash Valid: {result.get('hash_valid', False)}")
     
     # Test 4: Hash Computation Demo
-    print("\n🧮 Hash Computation Demo")
-    simple_cert = {"cert_type": "backup", "cert_id": "hash_demo"}
-    cert_json = json.dumps(simple_cert, separators=(',', ':'))
-    expected_hash = hashlib.sha256(cert_json.encode('utf-8')).hexdigest()
-    
-    response = requests.post(f"{base_url}/verify", json=simple_cert)
-    result = response.json()
-    computed_hash = result.get('computed', {}).get('certificate_json_sha256', '')
+    out.append("\n🧮 Hash Computation Demo")
+    expected_hash = FIXTURE_HASHES["simple"]
+    computed_hash = simple_result.get('computed', {}).get('certificate_json_sha256', '')
     
-    print(f"   Expected: {expected_hash[:32]}...")
-    print(f"   Computed: {computed_hash[:32]}...")
-    print(f"   Match: {expected_hash == computed_hash}")
+    out.append(f"   Expected: {expected_hash[:32]}...")
+    out.append(f"   Computed: {computed_hash[:32]}...")
+    out.append(f"   Match: {expected_hash == computed_hash}")
     
     # Test 5: Chain Linkage Demo
-    print("\n🔗 Chain Linkage Demo")
+    out.append("\n🔗 Chain Linkage Demo")
+    out.append(f"   Chain Valid: {wipe_result.get('chain_valid', 'None')}")
+    out.append(f"   Has Linkage: {'linkage' in WIPE_CERT}")
+    out.append(f"   Has Backup: {'linked_backup_cert' in WIPE_CERT}")
     
-    # Create backup cert
-    backup_cert = {
-        "cert_type": "backup",
-        "cert_id": "chain_backup_001",
-        # ... other required fields would go here
-    }
-    
-    # Create wipe cert with linkage
-    wipe_cert = {
-        "cert_type": "wipe", 
-        "cert_id": "chain_wipe_001",
-        "linkage": {
-            "backup_cert_id": "chain_backup_001"  # Links to backup
-        },
-        "linked_backup_cert": backup_cert,  # Include backup for validation
-        # ... other required fields would go here
-    }
+    # Test 6: Batch Verification
+    out.append("\n📦 Batch Verification Demo")
+    results = batch_result.get("results", [])
+    out.append(f"   Certificates Verified: {len(results)}")
+    out.append(f"   Signatures Rejected: {sum(1 for r in results if r.get('signature_valid') is False)}")
+    out.append(f"   All Requests Completed In: {elapsed * 1000:.1f} ms (sent concurrently)")
     
-    response = requests.post(f"{base_url}/verify", json=wipe_cert)
-    result = response.json()
-    print(f"   Chain Valid: {result.get('chain_valid', 'None')}")
-    print(f"   Has Linkage: {'linkage' in wipe_cert}")
-    print(f"   Has Backup: {'linked_backup_cert' in wipe_cert}")
+    out.append("\n🎯 All Verification Features Demonstrated!")
+    out.append("\nImplemented Features:")
+    out.append("  ✅ Ed25519 signature verification with PyNaCl")
+    out.append("  ✅ RFC 8785 JSON canonicalization")
+    out.append("  ✅ SHA256 hash recomputation and validation")
+    out.append("  ✅ Chain linkage validation between certificates")
+    out.append("  ✅ Batch verification in a single request")
+    out.append("  ✅ JSON schema validation for backup/wipe certificates")
+    out.append("  ✅ Comprehensive error handling and reporting")
+    out.append("  ✅ RESTful API integration with FastAPI")
     
-    print("\n🎯 All Verification Features Demonstrated!")
-    print("\nImplemented Features:")
-    print("  ✅ Ed25519 signature verification with PyNaCl")
-    print("  ✅ RFC 8785 JSON canonicalization")
-    print("  ✅ SHA256 hash recomputation and validation")
-    print("  ✅ Chain linkage validation between certificates")
-    print("  ✅ JSON schema validation for backup/wipe certificates")
-    print("  ✅ Comprehensive error handling and reporting")
-    print("  ✅ RESTful API integration with FastAPI")
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
     
     return True
 
@@ -3,10 +3,12 @@
 Run the SecureWipe Verification Portal
 
 Usage:
-    python run.py [--host 0.0.0.0] [--port 8000]
+    python run.py [--host 0.0.0.0] [--port 8000] [--workers N]
 """
 
 import argparse
+import os
+import ssl
 import uvicorn
 
 
@@ -15,14 +17,30 @@ def main():
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     parser.add_argument("--reload", action="store_true", help="Enable auto-reload for development")
+    parser.add_argument("--workers", type=int, default=os.environ.get("UVICORN_WORKERS"),
+                        help="Worker processes (default: $UVICORN_WORKERS, else 1 with --reload "
+                             "and one per CPU without)")
     
     args = parser.parse_args()
+    if args.workers is None:
+        args.workers = 1 if args.reload else os.cpu_count() or 1
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.reload and args.workers > 1:
+        parser.error("--reload cannot be combined with more than one worker")
+    
+    # Certificate hashes go through hashlib, which uses this OpenSSL build;
+    # OpenSSL 1.1.1+ picks SHA-NI/ARMv8 SHA instructions where the CPU has them
+    print(f"Hashing backend: {ssl.OPENSSL_VERSION}")
     
     uvicorn.run(
         "app.main:app",
         host=args.host,
         port=args.port,
-        reload=args.reload
+        reload=args.reload,
+        workers=args.workers,
+        loop="uvloop",
+        http="httptools"
     )
 
 
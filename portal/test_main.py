@@ -4,22 +4,45 @@ Unit tests for the SecureWipe Verification Portal
 Tests valid and invalid certificate payloads against the FastAPI endpoints.
 """
 
-import json
 import copy
 import base64
 import hashlib
 import pytest
+import fastjsonschema
+import orjson
 from fastapi.testclient import TestClient
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
-from app.main import app, validate_certificate, canonicalize_json, verify_ed25519_signature
+from app.main import app, validate_certificate, validate_chain_linkage, canonicalize_json, verify_ed25519_signature, VERIFY_RESULT_CACHE
+from app.result_cache import ResultCache
+from app.validator_cache import get_validator, get_compiled_validator, _compiled_validator_for_key
 
 
 # Test client
 client = TestClient(app)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def client_session():
+    """
+    Keep the test client open for the whole session
+    
+    An unopened TestClient starts a fresh event loop thread for every request;
+    inside the context manager one loop serves them all.
+    """
+    with client:
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_verify_cache():
+    """Keep cached /verify results from leaking between tests that mock verification"""
+    VERIFY_RESULT_CACHE.clear()
+    yield
+    VERIFY_RESULT_CACHE.clear()
+
+
 # Sample valid backup certificate
 VALID_BACKUP_CERT = {
     "cert_type": "backup",
@@ -151,6 +174,48 @@ VALID_WIPE_CERT = {
 }
 
 
+def cert_with(base, **overrides):
+    """
+    Copy a fixture certificate with some top-level fields replaced
+    
+    The copy is shallow, so nested objects are shared with the fixture. Tests
+    change a nested field by overriding its parent, e.g.
+    cert_with(VALID_BACKUP_CERT, signature={**VALID_BACKUP_CERT["signature"], "alg": "RSA"})
+    """
+    return {**base, **overrides}
+
+
+def cert_bytes(cert):
+    """Serialize a certificate to the canonical JSON body the portal receives"""
+    return canonicalize_json(cert)
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def post_json(url, payload):
+    """POST a JSON payload serialized with orjson rather than httpx's stdlib json"""
+    return client.post(url, content=orjson.dumps(payload), headers=JSON_HEADERS)
+
+
+@pytest.fixture(scope="session")
+def valid_backup_cert_bytes():
+    """Compact JSON body of the valid backup certificate, serialized once per session"""
+    return cert_bytes(VALID_BACKUP_CERT)
+
+
+@pytest.fixture(scope="session")
+def valid_backup_cert_sha256(valid_backup_cert_bytes):
+    """Hex SHA-256 of valid_backup_cert_bytes, computed once per session"""
+    return hashlib.sha256(valid_backup_cert_bytes).hexdigest()
+
+
+@pytest.fixture(scope="session")
+def valid_wipe_cert_bytes():
+    """Compact JSON body of the valid wipe certificate, serialized once per session"""
+    return cert_bytes(VALID_WIPE_CERT)
+
+
 class TestCanonicalization:
     """Test RFC 8785 JSON canonicalization"""
     
@@ -180,42 +245,60 @@ class TestCanonicalization:
         assert canonical1 == canonical2
         
         # Should be sorted keys with no whitespace
-        canonical_str = canonical1.decode('utf-8')
-        assert canonical_str == '{"a_field":42,"nested":{"first":1,"second":2},"z_field":"value"}'
+        assert canonical1 == b'{"a_field":42,"nested":{"first":1,"second":2},"z_field":"value"}'
+    
+    def test_canonicalize_golden(self):
+        """Test output matches the golden vector in core/src/signer.rs"""
+        obj = {
+            "cert_type": "backup",
+            "cert_id": "backup_001",
+            "created_at": "2023-01-01T00:00:00Z"
+        }
+        
+        expected = b'{"cert_id":"backup_001","cert_type":"backup","created_at":"2023-01-01T00:00:00Z"}'
+        assert canonicalize_json(obj) == expected
+    
+    def test_canonicalize_numbers_match_signer(self):
+        """Test numbers are formatted like serde_json in the Rust signer, not re-normalized"""
+        obj = {"percent": 15.0, "ratio": 0.5, "large": 1e22, "small": 1e-7, "count": 1543}
+        
+        expected = b'{"count":1543,"large":1e22,"percent":15.0,"ratio":0.5,"small":1e-7}'
+        assert canonicalize_json(obj) == expected
+    
+    def test_canonicalize_key_order_matches_signer(self):
+        """Test keys sort by UTF-8 bytes like the signer's BTreeMap, not by UTF-16 units"""
+        obj = {"\U0001F600": 1, "\ue000": 2}
+        
+        expected = '{"\ue000":2,"\U0001F600":1}'.encode("utf-8")
+        assert canonicalize_json(obj) == expected
 
 
 class TestSignatureVerification:
     """Test Ed25519 signature verification"""
     
-    @patch('app.main.PUBLIC_KEY_BYTES', b'\x00' * 32)  # Mock public key
-    @patch('app.main.VerifyKey')
-    def test_verify_valid_signature(self, mock_verify_key_class):
+    @patch('app.main.VERIFY_KEY')  # Mock public key
+    def test_verify_valid_signature(self, mock_verify_key):
         """Test verification of valid signature"""
-        mock_verify_key = MagicMock()
         mock_verify_key.verify.return_value = None  # No exception = valid
-        mock_verify_key_class.return_value = mock_verify_key
         
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
+        cert = cert_with(VALID_BACKUP_CERT)
         result = verify_ed25519_signature(cert)
         assert result is True
     
-    @patch('app.main.PUBLIC_KEY_BYTES', b'\x00' * 32)
-    @patch('app.main.VerifyKey')
-    def test_verify_invalid_signature(self, mock_verify_key_class):
+    @patch('app.main.VERIFY_KEY')
+    def test_verify_invalid_signature(self, mock_verify_key):
         """Test verification of invalid signature"""
         from nacl.exceptions import BadSignatureError
         
-        mock_verify_key = MagicMock()
         mock_verify_key.verify.side_effect = BadSignatureError()
-        mock_verify_key_class.return_value = mock_verify_key
         
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
+        cert = cert_with(VALID_BACKUP_CERT)
         result = verify_ed25519_signature(cert)
         assert result is False
     
     def test_verify_missing_signature(self):
         """Test verification when signature is missing"""
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
+        cert = cert_with(VALID_BACKUP_CERT)
         del cert["signature"]
         
         result = verify_ed25519_signature(cert)
@@ -223,37 +306,56 @@ class TestSignatureVerification:
     
     def test_verify_wrong_algorithm(self):
         """Test verification with wrong algorithm"""
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
-        cert["signature"]["alg"] = "RSA"
+        cert = cert_with(VALID_BACKUP_CERT, signature={**VALID_BACKUP_CERT["signature"], "alg": "RSA"})
         
         result = verify_ed25519_signature(cert)
         assert result is False
     
     def test_verify_wrong_pubkey_id(self):
         """Test verification with wrong pubkey_id"""
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
-        cert["signature"]["pubkey_id"] = "wrong_key"
+        cert = cert_with(VALID_BACKUP_CERT, signature={**VALID_BACKUP_CERT["signature"], "pubkey_id": "wrong_key"})
         
         result = verify_ed25519_signature(cert)
         assert result is False
+    
+    def test_verify_real_signature_leaves_cert_intact(self):
+        """Test a real Ed25519 signature verifies and the certificate is restored"""
+        from nacl.signing import SigningKey
+        
+        signing_key = SigningKey.generate()
+        cert = cert_with(VALID_BACKUP_CERT)
+        del cert["signature"]
+        signed = signing_key.sign(canonicalize_json(cert)).signature
+        cert["signature"] = {
+            "alg": "Ed25519",
+            "pubkey_id": "sih_root_v1",
+            "sig": base64.b64encode(signed).decode("ascii")
+        }
+        original = copy.deepcopy(cert)
+        
+        with patch('app.main.VERIFY_KEY', signing_key.verify_key):
+            assert verify_ed25519_signature(cert) is True
+        assert cert == original
+        
+        cert["cert_id"] = "tampered"
+        with patch('app.main.VERIFY_KEY', signing_key.verify_key):
+            assert verify_ed25519_signature(cert) is False
+        assert "signature" in cert
 
 
 class TestValidateCertificate:
     """Test certificate validation with all features"""
     
     @patch('app.main.verify_ed25519_signature')
-    def test_valid_backup_cert_with_hash(self, mock_verify_sig):
+    def test_valid_backup_cert_with_hash(self, mock_verify_sig, valid_backup_cert_bytes, valid_backup_cert_sha256):
         """Test valid backup certificate with hash verification"""
         mock_verify_sig.return_value = True
         
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
-        cert_json = json.dumps(cert, separators=(',', ':')).encode('utf-8')
+        # Set expected hash to match the hash of the body as sent
+        computed_hash = valid_backup_cert_sha256
+        cert = cert_with(VALID_BACKUP_CERT, metadata={**VALID_BACKUP_CERT["metadata"], "certificate_json_sha256": computed_hash})
         
-        # Set expected hash to match computed hash
-        computed_hash = hashlib.sha256(cert_json).hexdigest()
-        cert["metadata"]["certificate_json_sha256"] = computed_hash
-        
-        result = validate_certificate(cert, cert_json)
+        result = validate_certificate(cert, valid_backup_cert_bytes)
         
         assert result.schema_valid is True
         assert result.signature_valid is True
@@ -262,31 +364,65 @@ class TestValidateCertificate:
         assert result.computed["certificate_json_sha256"] == computed_hash
         assert len(result.errors) == 0
     
+    def test_certificate_hash_uses_openssl(self):
+        """Test certificate hashes go through OpenSSL's SHA-256 rather than a fallback"""
+        from app.main import compute_certificate_hash
+        
+        assert type(hashlib.sha256()).__module__ == "_hashlib"
+        assert compute_certificate_hash(b"abc") == (
+            "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+        )
+    
     @patch('app.main.verify_ed25519_signature')
     def test_backup_cert_hash_mismatch(self, mock_verify_sig):
         """Test backup certificate with hash mismatch"""
         mock_verify_sig.return_value = True
         
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
-        cert["metadata"]["certificate_json_sha256"] = "wrong_hash"
-        cert_json = json.dumps(cert, separators=(',', ':')).encode('utf-8')
+        cert = cert_with(VALID_BACKUP_CERT, metadata={**VALID_BACKUP_CERT["metadata"], "certificate_json_sha256": "wrong_hash"})
+        cert_json = cert_bytes(cert)
         
         result = validate_certificate(cert, cert_json)
         
         assert result.hash_valid is False
-        assert any("hash mismatch" in error.lower() for error in result.errors)
+        assert "HASH_MISMATCH" in result.error_codes
+    
+    @patch('app.main.verify_ed25519_signature')
+    @patch('app.main.get_compiled_validator', side_effect=AssertionError("validator rebuilt"))
+    @patch('app.main.get_validator', side_effect=AssertionError("validator rebuilt"))
+    def test_validation_reuses_startup_validators(self, _get_validator, _get_compiled, mock_verify_sig):
+        """Test validating a certificate never compiles or looks up a schema validator"""
+        mock_verify_sig.return_value = None
+        
+        valid = validate_certificate(cert_with(VALID_WIPE_CERT), b"{}")
+        invalid = validate_certificate({"cert_type": "backup"}, b"{}")
+        
+        assert valid.schema_valid is True
+        assert invalid.schema_valid is False
+    
+    @patch('app.main.verify_ed25519_signature')
+    def test_schema_errors_capped(self, mock_verify_sig):
+        """Test only the first few schema errors are reported"""
+        mock_verify_sig.return_value = None
+        
+        cert = {"cert_type": "backup", "cert_id": 1, "device": 2, "crypto": 3, "destination": 4}
+        cert_json = cert_bytes(cert)
+        
+        result = validate_certificate(cert, cert_json)
+        
+        schema_errors = [error for error in result.errors if error.startswith("Schema validation error")]
+        assert result.schema_valid is False
+        assert len(schema_errors) == 3
+        assert "Further schema validation errors omitted" in result.errors
     
     @patch('app.main.verify_ed25519_signature')
-    def test_wipe_cert_with_valid_linkage(self, mock_verify_sig):
+    def test_wipe_cert_with_valid_linkage(self, mock_verify_sig, valid_wipe_cert_bytes):
         """Test wipe certificate with valid chain linkage"""
         mock_verify_sig.return_value = True
         
-        wipe_cert = copy.deepcopy(VALID_WIPE_CERT)
-        backup_cert = copy.deepcopy(VALID_BACKUP_CERT)
-        
-        cert_json = json.dumps(wipe_cert, separators=(',', ':')).encode('utf-8')
+        wipe_cert = cert_with(VALID_WIPE_CERT)
+        backup_cert = cert_with(VALID_BACKUP_CERT)
         
-        result = validate_certificate(wipe_cert, cert_json, backup_cert)
+        result = validate_certificate(wipe_cert, valid_wipe_cert_bytes, backup_cert)
         
         assert result.schema_valid is True
         assert result.signature_valid is True
@@ -295,42 +431,55 @@ class TestValidateCertificate:
         assert len(result.errors) == 0
     
     @patch('app.main.verify_ed25519_signature')
-    def test_wipe_cert_linkage_mismatch(self, mock_verify_sig):
+    def test_wipe_cert_invalid_linked_backup(self, mock_verify_sig, valid_wipe_cert_bytes):
+        """Test linked backup certificate is checked against the backup schema"""
+        mock_verify_sig.return_value = True
+        
+        wipe_cert = cert_with(VALID_WIPE_CERT)
+        backup_cert = cert_with(VALID_BACKUP_CERT)
+        del backup_cert["device"]
+        
+        result = validate_certificate(wipe_cert, valid_wipe_cert_bytes, backup_cert)
+        
+        assert result.schema_valid is True
+        assert result.chain_valid is False
+        assert "Linked backup certificate schema error: 'device' is a required property" in result.errors
+    
+    @patch('app.main.verify_ed25519_signature')
+    def test_wipe_cert_linkage_mismatch(self, mock_verify_sig, valid_wipe_cert_bytes):
         """Test wipe certificate with mismatched linkage"""
         mock_verify_sig.return_value = True
         
-        wipe_cert = copy.deepcopy(VALID_WIPE_CERT)
-        backup_cert = copy.deepcopy(VALID_BACKUP_CERT)
+        wipe_cert = cert_with(VALID_WIPE_CERT)
+        backup_cert = cert_with(VALID_BACKUP_CERT)
         
         # Mismatch the cert IDs
         backup_cert["cert_id"] = "different_backup_id"
         
-        cert_json = json.dumps(wipe_cert, separators=(',', ':')).encode('utf-8')
-        
-        result = validate_certificate(wipe_cert, cert_json, backup_cert)
+        result = validate_certificate(wipe_cert, valid_wipe_cert_bytes, backup_cert)
         
         assert result.chain_valid is False
-        assert any("linkage validation failed" in error.lower() for error in result.errors)
+        assert "LINKAGE_MISMATCH" in result.error_codes
     
     @patch('app.main.verify_ed25519_signature')
     def test_tampered_certificate_signature_invalid(self, mock_verify_sig):
         """Test certificate with tampered content (invalid signature)"""
         mock_verify_sig.return_value = False
         
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
+        cert = cert_with(VALID_BACKUP_CERT)
         cert["cert_id"] = "tampered_id"  # Tamper with the content
-        cert_json = json.dumps(cert, separators=(',', ':')).encode('utf-8')
+        cert_json = cert_bytes(cert)
         
         result = validate_certificate(cert, cert_json)
         
         assert result.signature_valid is False
-        assert any("invalid ed25519 signature" in error.lower() for error in result.errors)
+        assert "INVALID_SIGNATURE" in result.error_codes
     
     def test_certificate_no_signature(self):
         """Test certificate without signature field"""
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
+        cert = cert_with(VALID_BACKUP_CERT)
         del cert["signature"]
-        cert_json = json.dumps(cert, separators=(',', ':')).encode('utf-8')
+        cert_json = cert_bytes(cert)
         
         result = validate_certificate(cert, cert_json)
         
@@ -344,10 +493,19 @@ class TestHealthEndpoint:
         """Test health endpoint returns expected response"""
         response = client.get("/health")
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["status"] == "healthy"
         assert "schemas_loaded" in data
         assert "public_key_loaded" in data
+    
+    def test_health_check_etag(self):
+        """Test repeat health probes are answered with 304"""
+        response = client.get("/health")
+        etag = response.headers["etag"]
+        
+        cached = client.get("/health", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
 
 
 class TestVerifyEndpoint:
@@ -358,72 +516,201 @@ class TestVerifyEndpoint:
         """Test verification of a valid backup certificate"""
         mock_verify_sig.return_value = True
         
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
+        cert = cert_with(VALID_BACKUP_CERT)
         
-        response = client.post("/verify", json=cert)
+        response = post_json("/verify", cert)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["schema_valid"] is True
         assert data["signature_valid"] is True
         assert "computed" in data
         assert "certificate_json_sha256" in data["computed"]
         assert data["cert_summary"]["cert_type"] == "backup"
     
+    @patch('app.main.verify_ed25519_signature')
+    def test_verify_repeated_body_uses_cache(self, mock_verify_sig, valid_backup_cert_bytes):
+        """Test that re-posting the same certificate skips verification"""
+        mock_verify_sig.return_value = True
+        body = valid_backup_cert_bytes
+        
+        first = client.post("/verify", content=body)
+        second = client.post("/verify", content=body)
+        assert first.status_code == second.status_code == 200
+        assert orjson.loads(first.content) == orjson.loads(second.content)
+        assert mock_verify_sig.call_count == 1
+        
+        # The check mode is part of the key
+        summary = client.post("/verify?check=summary-only", content=body)
+        assert orjson.loads(summary.content)["signature_valid"] is None
+    
+    def test_verify_does_not_cache_large_responses(self):
+        """Test that responses echoing a large client string are not cached"""
+        response = post_json("/verify", cert_with(VALID_BACKUP_CERT, cert_type="x" * 100_000))
+        assert response.status_code == 200
+        assert "UNKNOWN_CERT_TYPE" in orjson.loads(response.content)["error_codes"]
+        assert len(VERIFY_RESULT_CACHE) == 0
+    
+    @patch('app.main.extract_cert_summary')
+    def test_verify_does_not_cache_internal_errors(self, mock_summary, valid_backup_cert_bytes):
+        """Test that a transient internal error is not replayed from the cache"""
+        mock_summary.side_effect = [RuntimeError("boom"), {"cert_type": "backup"}]
+        
+        first = client.post("/verify?check=summary-only", content=valid_backup_cert_bytes)
+        assert "INTERNAL_ERROR" in orjson.loads(first.content)["error_codes"]
+        second = client.post("/verify?check=summary-only", content=valid_backup_cert_bytes)
+        assert orjson.loads(second.content)["error_codes"] == []
+        assert mock_summary.call_count == 2
+    
     @patch('app.main.verify_ed25519_signature')
     def test_verify_wipe_with_linked_backup(self, mock_verify_sig):
         """Test verification of wipe certificate with linked backup"""
         mock_verify_sig.return_value = True
         
-        wipe_cert = copy.deepcopy(VALID_WIPE_CERT)
-        backup_cert = copy.deepcopy(VALID_BACKUP_CERT)
+        wipe_cert = cert_with(VALID_WIPE_CERT)
+        backup_cert = cert_with(VALID_BACKUP_CERT)
         
         # Include linked backup certificate
         request_data = wipe_cert.copy()
         request_data["linked_backup_cert"] = backup_cert
         
-        response = client.post("/verify", json=request_data)
+        response = post_json("/verify", request_data)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["schema_valid"] is True
         assert data["signature_valid"] is True
         assert data["chain_valid"] is True
         assert data["computed"]["linked_backup_sha256"] is not None
     
+    @patch('app.main.verify_ed25519_signature')
+    def test_verify_summary_only(self, mock_verify_sig):
+        """Test summary-only check skips all verification"""
+        cert = cert_with(VALID_BACKUP_CERT)
+        
+        response = post_json("/verify?check=summary-only", cert)
+        assert response.status_code == 200
+        
+        data = orjson.loads(response.content)
+        assert data["schema_valid"] is None
+        assert data["signature_valid"] is None
+        assert data["cert_summary"]["cert_id"] == "backup_20231205_143022_f4a2b8c1"
+        assert data["computed"]["certificate_json_sha256"] is not None
+        mock_verify_sig.assert_not_called()
+    
+    @patch('app.main.verify_ed25519_signature')
+    def test_verify_signature_check_skips_schema(self, mock_verify_sig):
+        """Test signature check mode reports signature validity without schema validation"""
+        mock_verify_sig.return_value = True
+        cert = cert_with(VALID_BACKUP_CERT)
+        del cert["device"]  # Would fail schema validation
+        
+        response = post_json("/verify?check=signature", cert)
+        assert response.status_code == 200
+        
+        data = orjson.loads(response.content)
+        assert data["schema_valid"] is None
+        assert data["signature_valid"] is True
+        assert "SCHEMA_INVALID" not in data["error_codes"]
+    
+    def test_verify_unknown_check_mode(self, valid_backup_cert_bytes):
+        """Test unsupported check mode is rejected"""
+        response = client.post("/verify?check=partial", content=valid_backup_cert_bytes, headers=JSON_HEADERS)
+        assert response.status_code == 422
+    
     def test_verify_invalid_json(self):
         """Test verification with invalid JSON"""
         response = client.post("/verify", data="invalid json")
         assert response.status_code == 400
-        assert "Invalid JSON" in response.json()["detail"]
+        assert "Invalid JSON" in orjson.loads(response.content)["detail"]
+    
+    def test_verify_body_too_large(self, valid_backup_cert_bytes):
+        """Test oversized bodies are rejected before parsing"""
+        with patch('app.main.MAX_BODY_BYTES', 64):
+            response = client.post("/verify", content=valid_backup_cert_bytes, headers=JSON_HEADERS)
+        assert response.status_code == 413
     
     def test_verify_empty_body(self):
         """Test verification with empty request body"""
         response = client.post("/verify", data="")
         assert response.status_code == 400
-        assert "Empty request body" in response.json()["detail"]
+        assert "Empty request body" in orjson.loads(response.content)["detail"]
     
     def test_verify_missing_cert_type(self):
         """Test verification with missing cert_type"""
         cert = {"cert_id": "test"}
         
-        response = client.post("/verify", json=cert)
+        response = post_json("/verify", cert)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["schema_valid"] is False
         assert "Missing 'cert_type' field" in data["errors"]
+        assert data["error_codes"] == ["MISSING_CERT_TYPE"]
     
     def test_verify_unknown_cert_type(self):
         """Test verification with unknown cert_type"""
         cert = {"cert_type": "unknown", "cert_id": "test"}
         
-        response = client.post("/verify", json=cert)
+        response = post_json("/verify", cert)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["schema_valid"] is False
-        assert any("Unknown certificate type" in error for error in data["errors"])
+        assert "UNKNOWN_CERT_TYPE" in data["error_codes"]
+
+
+class TestBatchVerifyEndpoint:
+    """Test the /verify/batch POST endpoint"""
+    
+    @patch('app.main.verify_ed25519_signature')
+    def test_verify_batch_results_in_order(self, mock_verify_sig):
+        """Test each certificate gets its own result, in request order"""
+        mock_verify_sig.return_value = True
+        
+        certs = [
+            cert_with(VALID_BACKUP_CERT),
+            {"cert_id": "test"},
+            cert_with(VALID_WIPE_CERT),
+            "not an object"
+        ]
+        
+        response = post_json("/verify/batch", {"certs": certs})
+        assert response.status_code == 200
+        
+        results = orjson.loads(response.content)["results"]
+        assert len(results) == 4
+        assert results[0]["schema_valid"] is True
+        assert results[0]["cert_summary"]["cert_type"] == "backup"
+        assert "Missing 'cert_type' field" in results[1]["errors"]
+        assert results[2]["schema_valid"] is True
+        assert results[2]["cert_summary"]["cert_type"] == "wipe"
+        assert "Certificate must be a JSON object" in results[3]["errors"]
+        assert results[3]["error_codes"] == ["NOT_AN_OBJECT"]
+    
+    @patch('app.main.verify_ed25519_signature')
+    def test_verify_batch_hash_matches_single_verify(self, mock_verify_sig):
+        """Test a batch entry with a linked backup hashes like the same /verify body"""
+        mock_verify_sig.return_value = True
+        entry = cert_with(VALID_WIPE_CERT, linked_backup_cert=cert_with(VALID_BACKUP_CERT))
+        
+        single = post_json("/verify", entry)
+        batch = post_json("/verify/batch", {"certs": [entry]})
+        single_hash = orjson.loads(single.content)["computed"]["certificate_json_sha256"]
+        batch_hash = orjson.loads(batch.content)["results"][0]["computed"]["certificate_json_sha256"]
+        assert batch_hash == single_hash == hashlib.sha256(orjson.dumps(entry)).hexdigest()
+    
+    def test_verify_batch_requires_certs_list(self, valid_backup_cert_bytes):
+        """Test batch body must contain a certs list"""
+        response = client.post("/verify/batch", content=valid_backup_cert_bytes, headers=JSON_HEADERS)
+        assert response.status_code == 400
+        assert "'certs' list" in orjson.loads(response.content)["detail"]
+    
+    def test_verify_batch_too_many_certs(self):
+        """Test oversized batches are rejected"""
+        with patch('app.main.MAX_BATCH_SIZE', 2):
+            response = post_json("/verify/batch", {"certs": [{}, {}, {}]})
+        assert response.status_code == 413
 
 
 class TestGetCertificateInfo:
@@ -434,12 +721,12 @@ class TestGetCertificateInfo:
         response = client.get("/verify/test_cert_id")
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "cert_id" in data
         assert data["cert_id"] == "test_cert_id"
         assert "message" in data
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["status"] == "healthy"
         assert "schemas_loaded" in data
         assert "version" in data
@@ -455,20 +742,45 @@ class TestHomeEndpoint:
         assert "text/html" in response.headers["content-type"]
         assert "SecureWipe Verification Portal" in response.text
         assert "/verify" in response.text
+    
+    def test_home_page_etag(self):
+        """Test home page is revalidated with its ETag"""
+        response = client.get("/")
+        etag = response.headers["etag"]
+        
+        cached = client.get("/", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert cached.content == b""
+    
+    def test_home_page_gzip(self):
+        """Test home page is served precompressed only when gzip is accepted"""
+        compressed = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "SecureWipe Verification Portal" in compressed.text
+        
+        plain = client.get("/", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.text == compressed.text
+        assert plain.headers["etag"] != compressed.headers["etag"]
+        assert plain.headers["vary"] == compressed.headers["vary"] == "Accept-Encoding"
+    
+    def test_home_page_gzip_refused(self):
+        """Test a zero q-value for gzip gets the uncompressed page"""
+        response = client.get("/", headers={"Accept-Encoding": "gzip;q=0, deflate"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
 
 
 class TestCertificateVerification:
     """Test certificate verification endpoint"""
     
-    def test_verify_valid_backup_certificate(self):
+    def test_verify_valid_backup_certificate(self, valid_backup_cert_bytes):
         """Test verification of a valid backup certificate"""
-        response = client.post(
-            "/verify",
-            json=VALID_BACKUP_CERT
-        )
+        response = client.post("/verify", content=valid_backup_cert_bytes, headers=JSON_HEADERS)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["schema_valid"] is True
         assert len(data["errors"]) == 0
         
@@ -478,15 +790,12 @@ class TestCertificateVerification:
         assert summary["device_model"] == "Samsung SSD 980 PRO 1TB"
         assert "usb" in summary["destination"]
     
-    def test_verify_valid_wipe_certificate(self):
+    def test_verify_valid_wipe_certificate(self, valid_wipe_cert_bytes):
         """Test verification of a valid wipe certificate"""
-        response = client.post(
-            "/verify",
-            json=VALID_WIPE_CERT
-        )
+        response = client.post("/verify", content=valid_wipe_cert_bytes, headers=JSON_HEADERS)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["schema_valid"] is True
         assert len(data["errors"]) == 0
         
@@ -496,64 +805,48 @@ class TestCertificateVerification:
         assert summary["device_model"] == "Samsung SSD 980 PRO 1TB"
         assert "PURGE" in summary["policy_method"]
     
-    def test_verify_missing_cert_type(self):
-        """Test verification fails when cert_type is missing"""
-        invalid_cert = {
-            "cert_id": "test_cert_123",
-            "device": {"model": "Test Device"}
-        }
-        
-        response = client.post("/verify", json=invalid_cert)
+    @pytest.mark.parametrize("invalid_cert, error_code", [
+        pytest.param(
+            {"cert_id": "test_cert_123", "device": {"model": "Test Device"}},
+            "MISSING_CERT_TYPE",
+            id="missing_cert_type"
+        ),
+        pytest.param(
+            {"cert_type": "invalid_type", "cert_id": "test_cert_123", "device": {"model": "Test Device"}},
+            "UNKNOWN_CERT_TYPE",
+            id="invalid_cert_type"
+        ),
+        # Missing device, files_summary, destination, crypto, created_at, signature
+        pytest.param({"cert_type": "backup", "cert_id": "test_backup_123"}, "SCHEMA_INVALID", id="missing_fields_backup"),
+        # Missing device, policy, commands, verify, created_at, signature
+        pytest.param({"cert_type": "wipe", "cert_id": "test_wipe_123"}, "SCHEMA_INVALID", id="missing_fields_wipe"),
+        pytest.param(
+            cert_with(VALID_BACKUP_CERT, destination={**VALID_BACKUP_CERT["destination"], "type": "invalid_destination_type"}),
+            "SCHEMA_INVALID",
+            id="invalid_enum_value"
+        ),
+        # Must be Ed25519
+        pytest.param(
+            cert_with(VALID_BACKUP_CERT, signature={**VALID_BACKUP_CERT["signature"], "alg": "RSA256"}),
+            "SCHEMA_INVALID",
+            id="invalid_signature_algorithm"
+        ),
+        # Must be "sih_root_v1"
+        pytest.param(
+            cert_with(VALID_BACKUP_CERT, signature={**VALID_BACKUP_CERT["signature"], "pubkey_id": "wrong_key_id"}),
+            "SCHEMA_INVALID",
+            id="invalid_pubkey_id"
+        ),
+    ])
+    def test_verify_rejects_invalid_certificate(self, invalid_cert, error_code):
+        """Test verification fails with the expected error code for invalid certificates"""
+        response = post_json("/verify", invalid_cert)
         assert response.status_code == 200
         
-        data = response.json()
-        assert data["schema_valid"] is False
-        assert any("cert_type" in error for error in data["errors"])
-    
-    def test_verify_invalid_cert_type(self):
-        """Test verification fails with invalid cert_type"""
-        invalid_cert = {
-            "cert_type": "invalid_type",
-            "cert_id": "test_cert_123",
-            "device": {"model": "Test Device"}
-        }
-        
-        response = client.post("/verify", json=invalid_cert)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["schema_valid"] is False
-        assert any("Unknown certificate type" in error for error in data["errors"])
-    
-    def test_verify_missing_required_fields_backup(self):
-        """Test backup certificate fails validation when required fields are missing"""
-        invalid_backup = {
-            "cert_type": "backup",
-            "cert_id": "test_backup_123"
-            # Missing required fields: device, files_summary, destination, crypto, created_at, signature
-        }
-        
-        response = client.post("/verify", json=invalid_backup)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["schema_valid"] is False
-        assert len(data["errors"]) > 0
-    
-    def test_verify_missing_required_fields_wipe(self):
-        """Test wipe certificate fails validation when required fields are missing"""
-        invalid_wipe = {
-            "cert_type": "wipe",
-            "cert_id": "test_wipe_123"
-            # Missing required fields: device, policy, commands, verify, created_at, signature
-        }
-        
-        response = client.post("/verify", json=invalid_wipe)
-        assert response.status_code == 200
-        
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["schema_valid"] is False
         assert len(data["errors"]) > 0
+        assert error_code in data["error_codes"]
     
     def test_verify_invalid_json(self):
         """Test endpoint handles invalid JSON gracefully"""
@@ -563,7 +856,7 @@ class TestCertificateVerification:
             headers={"Content-Type": "application/json"}
         )
         assert response.status_code == 400
-        assert "Invalid JSON" in response.json()["detail"]
+        assert "Invalid JSON" in orjson.loads(response.content)["detail"]
     
     def test_verify_empty_body(self):
         """Test endpoint handles empty request body"""
@@ -573,43 +866,7 @@ class TestCertificateVerification:
             headers={"Content-Type": "application/json"}
         )
         assert response.status_code == 400
-        assert "Empty request body" in response.json()["detail"]
-    
-    def test_verify_invalid_enum_values(self):
-        """Test validation fails for invalid enum values"""
-        invalid_backup = copy.deepcopy(VALID_BACKUP_CERT)
-        invalid_backup["destination"]["type"] = "invalid_destination_type"
-        
-        response = client.post("/verify", json=invalid_backup)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["schema_valid"] is False
-        assert len(data["errors"]) > 0
-    
-    def test_verify_invalid_signature_algorithm(self):
-        """Test validation fails for invalid signature algorithm"""
-        invalid_backup = copy.deepcopy(VALID_BACKUP_CERT)
-        invalid_backup["signature"]["alg"] = "RSA256"  # Invalid, must be Ed25519
-        
-        response = client.post("/verify", json=invalid_backup)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["schema_valid"] is False
-        assert len(data["errors"]) > 0
-    
-    def test_verify_invalid_pubkey_id(self):
-        """Test validation fails for invalid pubkey_id"""
-        invalid_backup = copy.deepcopy(VALID_BACKUP_CERT)
-        invalid_backup["signature"]["pubkey_id"] = "wrong_key_id"  # Must be "sih_root_v1"
-        
-        response = client.post("/verify", json=invalid_backup)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["schema_valid"] is False
-        assert len(data["errors"]) > 0
+        assert "Empty request body" in orjson.loads(response.content)["detail"]
 
 
 class TestCertificateInfoEndpoint:
@@ -621,7 +878,7 @@ class TestCertificateInfoEndpoint:
         response = client.get(f"/verify/{cert_id}")
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "not implemented in MVP" in data["message"]
         assert data["cert_id"] == cert_id
         assert "hint" in data
@@ -631,13 +888,11 @@ class TestValidationFunction:
     """Test the validation function directly"""
     
     @patch('app.main.verify_ed25519_signature')
-    def test_extract_backup_summary(self, mock_verify_sig):
+    def test_extract_backup_summary(self, mock_verify_sig, valid_backup_cert_bytes):
         """Test summary extraction for backup certificate"""
         mock_verify_sig.return_value = True
         
-        cert = copy.deepcopy(VALID_BACKUP_CERT)
-        cert_json = json.dumps(cert, separators=(',', ':')).encode('utf-8')
-        result = validate_certificate(cert, cert_json)
+        result = validate_certificate(cert_with(VALID_BACKUP_CERT), valid_backup_cert_bytes)
         
         summary = result.cert_summary
         assert summary["cert_type"] == "backup"
@@ -645,19 +900,91 @@ class TestValidationFunction:
         assert summary["device_model"] == "Samsung SSD 980 PRO 1TB"
     
     @patch('app.main.verify_ed25519_signature')
-    def test_extract_wipe_summary(self, mock_verify_sig):
+    def test_extract_wipe_summary(self, mock_verify_sig, valid_wipe_cert_bytes):
         """Test summary extraction for wipe certificate"""
         mock_verify_sig.return_value = True
         
-        cert = copy.deepcopy(VALID_WIPE_CERT)
-        cert_json = json.dumps(cert, separators=(',', ':')).encode('utf-8')
-        result = validate_certificate(cert, cert_json)
+        result = validate_certificate(cert_with(VALID_WIPE_CERT), valid_wipe_cert_bytes)
         
         summary = result.cert_summary
         assert summary["cert_type"] == "wipe"
         assert summary["cert_id"] == "wipe_20231205_150030_a8b9c7d2"
         assert summary["device_model"] == "Samsung SSD 980 PRO 1TB"
         assert "PURGE" in summary["policy_method_or_destination"]
+    
+    def test_chain_linkage(self):
+        """Test chain linkage compares the wipe's backup_cert_id with the backup's cert_id"""
+        wipe = cert_with(VALID_WIPE_CERT)
+        backup = {**VALID_BACKUP_CERT, "cert_id": wipe["linkage"]["backup_cert_id"]}
+        
+        assert validate_chain_linkage(wipe, backup) is True
+        assert validate_chain_linkage(wipe, {**backup, "cert_id": "other_backup"}) is False
+        assert validate_chain_linkage(wipe, None) is None
+        
+        del wipe["linkage"]
+        assert validate_chain_linkage(wipe, backup) is None
+
+
+class TestValidatorCache:
+    """Test reuse of compiled schema validators"""
+    
+    SCHEMA = {
+        "type": "object",
+        "required": ["cert_id"],
+        "properties": {"cert_id": {"type": "string"}}
+    }
+    
+    def test_equal_schemas_share_validator(self):
+        """Test that equal schemas map to the same validator regardless of key order"""
+        reordered = {"properties": {"cert_id": {"type": "string"}}, "required": ["cert_id"], "type": "object"}
+        assert get_validator(self.SCHEMA) is get_validator(reordered)
+        assert get_compiled_validator(self.SCHEMA) is get_compiled_validator(reordered)
+    
+    def test_cached_validators_validate(self):
+        """Test that cached validators still report errors"""
+        assert list(get_validator(self.SCHEMA).iter_errors({"cert_id": "abc"})) == []
+        assert len(list(get_validator(self.SCHEMA).iter_errors({}))) == 1
+        
+        with pytest.raises(fastjsonschema.JsonSchemaValueException):
+            get_compiled_validator(self.SCHEMA)({})
+    
+    def test_compiled_code_cache_dir(self, tmp_path, monkeypatch):
+        """Test that generated validator code is persisted and reloaded from disk"""
+        schema = {"type": "object", "required": ["backup_cert_id"]}
+        monkeypatch.setenv("SECUREWIPE_VALIDATOR_CACHE_DIR", str(tmp_path))
+        _compiled_validator_for_key.cache_clear()
+        try:
+            get_compiled_validator(schema)({"backup_cert_id": "abc"})
+            cached_files = list(tmp_path.glob("schema_validator_*.py"))
+            assert len(cached_files) == 1
+            
+            # A fresh process-level cache loads the persisted module
+            _compiled_validator_for_key.cache_clear()
+            validator = get_compiled_validator(schema)
+            assert list(tmp_path.glob("schema_validator_*.py")) == cached_files
+            with pytest.raises(fastjsonschema.JsonSchemaValueException):
+                validator({})
+        finally:
+            _compiled_validator_for_key.cache_clear()
+
+
+class TestResultCache:
+    """Test the size bounds of the /verify result cache"""
+    
+    def test_evicts_oldest_past_byte_limit(self):
+        cache = ResultCache(max_entries=10, max_bytes=10, max_entry_bytes=8)
+        cache.put("a", b"1234")
+        cache.put("b", b"5678")
+        assert cache.get("a") == b"1234"  # now most recently used
+        cache.put("c", b"90ab")
+        assert cache.get("b") is None
+        assert cache.total_bytes == 8
+    
+    def test_skips_oversized_entries(self):
+        cache = ResultCache(max_entries=10, max_bytes=100, max_entry_bytes=8)
+        cache.put("big", b"x" * 9)
+        assert len(cache) == 0
+        assert cache.total_bytes == 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+"""
+QR code rendering shared by the certificate PDF tests
+
+test_pdf_certificates.py and test_wipe_pdf_certificates.py both embed a QR
+code in every PDF. PNG bytes are cached per payload and encoder settings, so
+re-rendering the same certificate skips the encode entirely.
+"""
+
+from functools import lru_cache
+from io import BytesIO
+
+import qrcode
+
+
+@lru_cache(maxsize=None)
+def _encoder(error_correction: int, border: int) -> qrcode.QRCode:
+    """One encoder per settings, shared by the process and reset before each use"""
+    return qrcode.QRCode(version=1, error_correction=error_correction, box_size=10, border=border)
+
+
+@lru_cache(maxsize=128)
+def render_qr_png(data: str, error_correction: int = qrcode.constants.ERROR_CORRECT_M,
+                  border: int = 4) -> bytes:
+    """Encode a QR code as PNG bytes; re-rendering the same certificate reuses them"""
+    qr = _encoder(error_correction, border)
+    qr.clear()
+    qr.version = 1  # clear() keeps the previously fitted version
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    img = qr.make_image(fill_color="black", back_color="white")
+    buffer = BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
@@ -0,0 +1,37 @@
+"""
+Wipe certificate schema shared by the wipe test scripts
+
+test_wipe_schema.py and test_wipe_pdf_certificates.py both validate against
+certs/schemas/wipe_schema.json; loading it here means a run that imports both
+parses and checks the schema once.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import jsonschema
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib parser
+    orjson = None
+
+PROJECT_ROOT = Path(__file__).parent.parent
+WIPE_SCHEMA_PATH = PROJECT_ROOT / "certs" / "schemas" / "wipe_schema.json"
+
+
+@lru_cache(maxsize=None)
+def load_schema():
+    """Load the wipe certificate JSON schema (cached; callers must not mutate it)"""
+    data = WIPE_SCHEMA_PATH.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+@lru_cache(maxsize=None)
+def get_validator():
+    """Check the schema against its metaschema once and build a reusable validator."""
+    schema = load_schema()
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
@@ -6,9 +6,15 @@ This test validates that certificate data conforms to the updated backup_schema.
 
 import json
 import sys
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib parser
+    orjson = None
+
 try:
     import jsonschema
 except ImportError:
@@ -16,24 +22,35 @@ except ImportError:
     sys.exit(1)
 
 
+@lru_cache(maxsize=None)
 def load_schema():
-    """Load the backup certificate schema."""
+    """Load the backup certificate schema (cached; callers must not mutate it)."""
     schema_path = Path(__file__).parent.parent / "certs" / "schemas" / "backup_schema.json"
     
     if not schema_path.exists():
         raise FileNotFoundError(f"Schema not found: {schema_path}")
     
-    with open(schema_path, 'r') as f:
-        return json.load(f)
+    data = schema_path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+@lru_cache(maxsize=None)
+def get_validator():
+    """Check the schema against its metaschema once and build a reusable validator."""
+    schema = load_schema()
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
 
 
 def create_test_certificate():
     """Create a test certificate matching the new schema."""
+    issued_at = datetime.now(timezone.utc).isoformat()
     return {
         "cert_type": "backup",
         "cert_id": "TEST_BCK_2024_001",
         "certificate_version": "v1.0.0", 
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": issued_at,
         "issuer": {
             "organization": "SecureWipe (SIH)",
             "tool_name": "securewipe",
@@ -105,7 +122,7 @@ def create_test_certificate():
             "logs_sha256": "b2c3d4e5f6789012345678901234567890123456789012345678901234567890",
             "qr_payload": {
                 "cert_id": "TEST_BCK_2024_001",
-                "issued_at": datetime.now(timezone.utc).isoformat(),
+                "issued_at": issued_at,
                 "device_model": "Samsung SSD 980 PRO 1TB",
                 "result": "PASS",
                 "nist_level": "CLEAR",
@@ -139,6 +156,7 @@ def test_schema_validation():
     
     try:
         schema = load_schema()
+        validator = get_validator()
         print(f"✓ Schema loaded successfully")
         print(f"  Schema ID: {schema.get('$id', 'N/A')}")
         print(f"  Title: {schema.get('title', 'N/A')}")
@@ -150,7 +168,7 @@ def test_schema_validation():
     valid_cert = create_test_certificate()
     
     try:
-        jsonschema.validate(valid_cert, schema)
+        validator.validate(valid_cert)
         print("✓ Valid certificate passed validation")
     except jsonschema.exceptions.ValidationError as e:
         print(f"✗ Valid certificate failed validation: {e}")
@@ -164,7 +182,7 @@ def test_schema_validation():
     invalid_cert = create_failing_certificate()
     
     try:
-        jsonschema.validate(invalid_cert, schema)
+        validator.validate(invalid_cert)
         print("✗ Invalid certificate incorrectly passed validation")
         return False
     except jsonschema.exceptions.ValidationError as e:
@@ -179,7 +197,7 @@ def test_schema_validation():
     if "examples" in schema and len(schema["examples"]) > 0:
         example = schema["examples"][0]
         try:
-            jsonschema.validate(example, schema)
+            validator.validate(example)
             print("✓ Schema example is valid")
         except jsonschema.exceptions.ValidationError as e:
             print(f"✗ Schema example failed validation: {e}")
@@ -190,6 +208,28 @@ def test_schema_validation():
     return True
 
 
+REQUIRED_FIELDS = frozenset({
+    "cert_type", "cert_id", "certificate_version", "created_at",
+    "issuer", "device", "files_summary", "destination", "crypto",
+    "verification", "policy", "result", "environment", "exceptions",
+    "signature", "metadata"
+})
+
+# (field path, its keys pre-split for lookup, check, message)
+STRUCTURE_CHECKS = [
+    (field_path, tuple(field_path.split('.')), check_func, error_msg)
+    for field_path, check_func, error_msg in [
+        ("cert_type", lambda x: x == "backup", "must be 'backup'"),
+        ("certificate_version", lambda x: x.startswith("v") and "." in x, "must be semver format"),
+        ("result", lambda x: x in ["PASS", "FAIL"], "must be PASS or FAIL"),
+        ("crypto.alg", lambda x: x == "AES-256-CTR", "must be AES-256-CTR"),
+        ("signature.alg", lambda x: x == "Ed25519", "must be Ed25519"),
+        ("signature.pubkey_id", lambda x: x == "sih_root_v1", "must be sih_root_v1"),
+        ("device.bus", lambda x: x in ["SATA", "NVMe", "USB", "SAS", "VIRTIO", "UNKNOWN"], "must be valid bus type")
+    ]
+]
+
+
 def test_certificate_structure():
     """Test that the certificate structure matches expectations."""
     print("\nTesting certificate structure...")
@@ -197,40 +237,19 @@ def test_certificate_structure():
     cert = create_test_certificate()
     
     # Check required top-level fields
-    required_fields = [
-        "cert_type", "cert_id", "certificate_version", "created_at",
-        "issuer", "device", "files_summary", "destination", "crypto",
-        "verification", "policy", "result", "environment", "exceptions",
-        "signature", "metadata"
-    ]
-    
-    missing_fields = []
-    for field in required_fields:
-        if field not in cert:
-            missing_fields.append(field)
-    
+    missing_fields = REQUIRED_FIELDS - cert.keys()
     if missing_fields:
-        print(f"✗ Missing required fields: {', '.join(missing_fields)}")
+        print(f"✗ Missing required fields: {', '.join(sorted(missing_fields))}")
         return False
     
-    print(f"✓ All {len(required_fields)} required fields present")
+    print(f"✓ All {len(REQUIRED_FIELDS)} required fields present")
     
     # Check specific field types and constraints
-    checks = [
-        ("cert_type", lambda x: x == "backup", "must be 'backup'"),
-        ("certificate_version", lambda x: x.startswith("v") and "." in x, "must be semver format"),
-        ("result", lambda x: x in ["PASS", "FAIL"], "must be PASS or FAIL"),
-        ("crypto.alg", lambda x: x == "AES-256-CTR", "must be AES-256-CTR"),
-        ("signature.alg", lambda x: x == "Ed25519", "must be Ed25519"),
-        ("signature.pubkey_id", lambda x: x == "sih_root_v1", "must be sih_root_v1"),
-        ("device.bus", lambda x: x in ["SATA", "NVMe", "USB", "SAS", "VIRTIO", "UNKNOWN"], "must be valid bus type")
-    ]
-    
-    for field_path, check_func, error_msg in checks:
+    for field_path, keys, check_func, error_msg in STRUCTURE_CHECKS:
         try:
             # Navigate nested fields
             value = cert
-            for part in field_path.split('.'):
+            for part in keys:
                 value = value[part]
             
             if check_func(value):
@@ -250,8 +269,10 @@ def save_test_certificate():
     cert = create_test_certificate()
     output_path = Path(__file__).parent / "sample_backup_certificate.json"
     
-    with open(output_path, 'w') as f:
-        json.dump(cert, f, indent=2)
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(cert, option=orjson.OPT_INDENT_2))
+    else:
+        output_path.write_text(json.dumps(cert, indent=2, ensure_ascii=False), encoding="utf-8")
     
     print(f"\n📄 Sample certificate saved to: {output_path}")
     print(f"   File size: {output_path.stat().st_size} bytes")
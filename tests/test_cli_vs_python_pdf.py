@@ -4,31 +4,35 @@ Compare CLI PDF generation with Python test script PDF generation
 Tests both schema compliance and PDF quality.
 """
 
-import json
 import os
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from pathlib import Path
 
+import orjson
+
 def validate_json_against_schema(json_file, schema_file):
     """Validate JSON file against schema using CLI"""
     try:
         result = subprocess.run([
             "/home/kinux/projects/erase-sure/core/target/release/securewipe",
             "cert", "validate", "--file", json_file
-        ], capture_output=True, text=True, cwd="/home/kinux/projects/erase-sure/core")
+        ], capture_output=True, cwd="/home/kinux/projects/erase-sure/core")
         
         if result.returncode == 0:
             # Parse the JSON output to get validation result
-            lines = result.stdout.strip().split('\n')
-            for line in lines:
-                if line.startswith('{') and 'schema_valid' in line:
-                    response = json.loads(line)
+            for line in result.stdout.splitlines():
+                if line.startswith(b'{') and b'schema_valid' in line:
+                    response = orjson.loads(line)
                     return response.get('schema_valid', False), response.get('schema_errors', [])
             return True, []
         else:
-            print(f"Validation failed: {result.stderr}")
-            return False, [result.stderr]
+            stderr = result.stderr.decode(errors='replace')
+            print(f"Validation failed: {stderr}")
+            return False, [stderr]
     except Exception as e:
         print(f"Error running validation: {e}")
         return False, [str(e)]
@@ -39,44 +43,48 @@ def generate_cli_pdf(cert_id):
         result = subprocess.run([
             "/home/kinux/projects/erase-sure/core/target/release/securewipe",
             "cert", "--export-pdf", cert_id
-        ], capture_output=True, text=True, cwd="/home/kinux/projects/erase-sure/core")
+        ], capture_output=True, cwd="/home/kinux/projects/erase-sure/core")
         
         if result.returncode == 0:
             # Parse output to get PDF path
-            lines = result.stdout.strip().split('\n')
-            for line in lines:
-                if line.startswith('{') and 'pdf_path' in line:
-                    response = json.loads(line)
+            for line in result.stdout.splitlines():
+                if line.startswith(b'{') and b'pdf_path' in line:
+                    response = orjson.loads(line)
                     return True, response.get('pdf_path', '')
         
-        print(f"CLI PDF generation failed: {result.stderr}")
-        return False, result.stderr
+        stderr = result.stderr.decode(errors='replace')
+        print(f"CLI PDF generation failed: {stderr}")
+        return False, stderr
     except Exception as e:
         print(f"Error generating CLI PDF: {e}")
         return False, str(e)
 
-def generate_python_pdf():
-    """Generate PDF using Python test script"""
+def generate_python_pdf(cert_file):
+    """Generate PDF using the Python test generator, in this process"""
     try:
-        result = subprocess.run([
-            "python", "test_pdf_certificates.py"
-        ], capture_output=True, text=True, cwd="/home/kinux/projects/erase-sure/tests")
+        from test_pdf_certificates import BackupCertificatePDFGenerator
         
-        if result.returncode == 0:
-            return True, "/tmp/test_backup_certificate.pdf"
-        else:
-            print(f"Python PDF generation failed: {result.stderr}")
-            return False, result.stderr
+        output_path = "/tmp/test_backup_certificate.pdf"
+        cert_data = orjson.loads(Path(cert_file).read_bytes())
+        # Schema validation is step 1 of the comparison, so don't repeat it.
+        # The PDF is rendered in memory and written in one call.
+        buffer = BytesIO()
+        if BackupCertificatePDFGenerator().create_certificate_pdf(cert_data, buffer, skip_validation=True):
+            Path(output_path).write_bytes(buffer.getbuffer())
+            return True, output_path
+        print("Python PDF generation failed")
+        return False, "create_certificate_pdf returned False"
     except Exception as e:
         print(f"Error generating Python PDF: {e}")
         return False, str(e)
 
 def analyze_pdf_content(pdf_path):
     """Analyze PDF content (basic file size analysis)"""
-    if not os.path.exists(pdf_path):
+    try:
+        stat = os.stat(pdf_path)
+    except FileNotFoundError:
         return {"exists": False}
     
-    stat = os.stat(pdf_path)
     return {
         "exists": True,
         "size_bytes": stat.st_size,
@@ -99,10 +107,16 @@ def main():
     
     schema_file = "/home/kinux/projects/erase-sure/certs/schemas/backup_schema.json"
     
+    # Each step waits on a separate process, so independent steps overlap
+    executor = ThreadPoolExecutor(max_workers=2)
+    
     for cert_info in test_certs:
         print(f"\nTesting: {cert_info['name']}")
         print("-" * 40)
         
+        # The Python generator doesn't depend on validation or the CLI
+        py_future = executor.submit(generate_python_pdf, cert_info['file'])
+        
         # 1. Validate JSON against schema
         print("1. Schema Validation:")
         valid, errors = validate_json_against_schema(cert_info['file'], schema_file)
@@ -113,11 +127,23 @@ def main():
                 print(f"      - {error}")
             if len(errors) > 3:
                 print(f"      ... and {len(errors) - 3} more errors")
+            # Every run writes the same output path, so let this one finish
+            py_future.result()
             continue
         
+        # First, ensure certificate is in the right location for CLI
+        cli_cert_path = f"/home/kinux/SecureWipe/certificates/{cert_info['cert_id']}.json"
+        os.makedirs(os.path.dirname(cli_cert_path), exist_ok=True)
+        
+        # Copy certificate to CLI expected location; copyfile skips copy2's
+        # metadata pass and uses the kernel's in-place copy on Linux
+        shutil.copyfile(cert_info['file'], cli_cert_path)
+        
+        cli_future = executor.submit(generate_cli_pdf, cert_info['cert_id'])
+        
         # 2. Generate Python PDF
         print("2. Python PDF Generation:")
-        py_success, py_path = generate_python_pdf()
+        py_success, py_path = py_future.result()
         print(f"   ✅ Success: {py_success}")
         if py_success:
             py_analysis = analyze_pdf_content(py_path)
@@ -128,16 +154,7 @@ def main():
         
         # 3. Generate CLI PDF
         print("3. CLI PDF Generation:")
-        
-        # First, ensure certificate is in the right location for CLI
-        cli_cert_path = f"/home/kinux/SecureWipe/certificates/{cert_info['cert_id']}.json"
-        os.makedirs(os.path.dirname(cli_cert_path), exist_ok=True)
-        
-        # Copy certificate to CLI expected location
-        import shutil
-        shutil.copy2(cert_info['file'], cli_cert_path)
-        
-        cli_success, cli_path = generate_cli_pdf(cert_info['cert_id'])
+        cli_success, cli_path = cli_future.result()
         print(f"   ✅ Success: {cli_success}")
         if cli_success:
             cli_analysis = analyze_pdf_content(cli_path)
@@ -166,6 +183,8 @@ def main():
         
         print()
     
+    executor.shutdown()
+    
     # 5. Final comparison with the specifically mentioned PDF
     print("5. Comparison with 'test_backup_certificate_fixed.pdf':")
     fixed_pdf = "/home/kinux/projects/erase-sure/tests/outputs/test_backup_certificate_fixed.pdf"
@@ -5,21 +5,71 @@ Tests both JSON validation and PDF output formatting.
 """
 
 import json
-import tempfile
-import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import jsonschema
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib parser
+    orjson = None
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-import qrcode
 from io import BytesIO
 import base64
 
+from _qr_cache import render_qr_png
+
+# Styles don't depend on the certificate, so every PDF shares one set
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    spaceAfter=30,
+    alignment=1,  # Center
+    textColor=colors.HexColor('#1f4e79')
+)
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=16,
+    spaceAfter=12,
+    textColor=colors.HexColor('#2f5f8f')
+)
+_PASS_RESULT_STYLE = ParagraphStyle('Result', parent=_STYLES['Normal'],
+                                    fontSize=18, textColor=colors.green, alignment=1)
+_FAIL_RESULT_STYLE = ParagraphStyle('Result', parent=_STYLES['Normal'],
+                                    fontSize=18, textColor=colors.red, alignment=1)
+
+
+def _key_value_table_style(font_size):
+    """Grid style shared by the label/value tables"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+
+_TABLE_STYLE = _key_value_table_style(10)
+_SIG_TABLE_STYLE = _key_value_table_style(9)
+_QR_TABLE_STYLE = TableStyle([('ALIGN', (0, 0), (-1, -1), 'CENTER')])
+
+
+def kv_table(rows, style=_TABLE_STYLE):
+    """Build a two-column label/value table with the shared grid style"""
+    table = Table(rows, colWidths=[2*inch, 4*inch])
+    table.setStyle(style)
+    return table
+
 
 def wrap_long_text(text, max_length=50):
     """Wrap long text to fit in table cells"""
@@ -51,6 +101,37 @@ def format_url(url, max_length=45):
             return protocol_domain + "/..."
     return url_str[:max_length-3] + "..."
 
+@lru_cache(maxsize=8)
+def load_schema(schema_path: Path) -> dict:
+    """Load a schema once per path, shared by every generator (callers must not mutate it)"""
+    data = schema_path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+@lru_cache(maxsize=8)
+def load_schema_validators(schema_path: Path):
+    """
+    Build the validators for a schema once per path, on first validation
+    
+    Returns (jsonschema validator, compiled validator). The compiled
+    fastjsonschema validator is None if fastjsonschema isn't installed or
+    can't compile the schema; jsonschema then validates on its own. Generators
+    that only render (skip_validation=True) never pay for either.
+    """
+    schema = load_schema(schema_path)
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    validator = validator_class(schema)
+    try:
+        import fastjsonschema
+    except ImportError:
+        return validator, None
+    try:
+        # Don't inject schema defaults into the certificate being checked
+        compiled_validator = fastjsonschema.compile(schema, use_default=False, use_formats=False)
+    except fastjsonschema.JsonSchemaDefinitionException:
+        compiled_validator = None
+    return validator, compiled_validator
+
 def create_clickable_url(url, display_text=None, style=None):
     """Create a clickable URL paragraph with full link preserved"""
     if not url:
@@ -73,14 +154,21 @@ class BackupCertificatePDFGenerator:
             self.schema_path = Path(__file__).parent.parent / "certs" / "schemas" / "backup_schema.json"
         else:
             self.schema_path = Path(schema_path)
-            
-        with open(self.schema_path, 'r') as f:
-            self.schema = json.load(f)
+        
+        self.schema = load_schema(self.schema_path)
     
     def validate_certificate(self, cert_data: dict) -> bool:
         """Validate certificate against the JSON schema."""
+        validator, compiled_validator = load_schema_validators(self.schema_path)
+        if compiled_validator is not None:
+            from fastjsonschema import JsonSchemaValueException
+            try:
+                compiled_validator(cert_data)
+                return True
+            except JsonSchemaValueException:
+                pass  # jsonschema reports the error with its path below
         try:
-            jsonschema.validate(cert_data, self.schema)
+            validator.validate(cert_data)
             return True
         except jsonschema.exceptions.ValidationError as e:
             print(f"Schema validation failed: {e}")
@@ -88,21 +176,17 @@ class BackupCertificatePDFGenerator:
     
     def generate_qr_code(self, data: str) -> Image:
         """Generate QR code for certificate verification."""
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(data)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to reportlab Image
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        
-        return Image(buffer, width=1.5*inch, height=1.5*inch)
+        # reportlab reads the buffer while building, so each flowable gets its own
+        return Image(BytesIO(render_qr_png(data, border=5)), width=1.5*inch, height=1.5*inch)
     
-    def create_certificate_pdf(self, cert_data: dict, output_path: str, skip_validation: bool = False) -> bool:
-        """Generate PDF certificate from validated JSON data."""
+    def create_certificate_pdf(self, cert_data: dict, output_path: str, skip_validation: bool = False,
+                               include_qr: bool = True) -> bool:
+        """
+        Generate PDF certificate from validated JSON data.
+        
+        With include_qr=False the QR code is neither encoded nor drawn; the
+        verification URL table is still included.
+        """
         
         # Validate first unless explicitly skipped
         if not skip_validation:
@@ -114,23 +198,9 @@ class BackupCertificatePDFGenerator:
                               rightMargin=72, leftMargin=72,
                               topMargin=72, bottomMargin=18)
         
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=1,  # Center
-            textColor=colors.HexColor('#1f4e79')
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            textColor=colors.HexColor('#2f5f8f')
-        )
+        styles = _STYLES
+        title_style = _TITLE_STYLE
+        heading_style = _HEADING_STYLE
         
         story = []
         
@@ -142,9 +212,7 @@ class BackupCertificatePDFGenerator:
         story.append(Spacer(1, 20))
         
         # Result Badge
-        result_color = colors.green if cert_data['result'] == 'PASS' else colors.red
-        result_style = ParagraphStyle('Result', parent=styles['Normal'], 
-                                    fontSize=18, textColor=result_color, alignment=1)
+        result_style = _PASS_RESULT_STYLE if cert_data['result'] == 'PASS' else _FAIL_RESULT_STYLE
         story.append(Paragraph(f"<b>RESULT: {cert_data['result']}</b>", result_style))
         story.append(Spacer(1, 20))
         
@@ -155,16 +223,7 @@ class BackupCertificatePDFGenerator:
             ['Tool', f"{cert_data['issuer']['tool_name']} v{cert_data['issuer']['tool_version']}"],
             ['Country', cert_data['issuer'].get('country', 'N/A')]
         ]
-        issuer_table = Table(issuer_data, colWidths=[2*inch, 4*inch])
-        issuer_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        issuer_table = kv_table(issuer_data)
         story.append(issuer_table)
         story.append(Spacer(1, 15))
         
@@ -177,16 +236,7 @@ class BackupCertificatePDFGenerator:
             ['Capacity', f"{cert_data['device']['capacity_bytes']:,} bytes"],
             ['Path', cert_data['device'].get('path', 'N/A')]
         ]
-        device_table = Table(device_data, colWidths=[2*inch, 4*inch])
-        device_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        device_table = kv_table(device_data)
         story.append(device_table)
         story.append(Spacer(1, 15))
         
@@ -199,16 +249,7 @@ class BackupCertificatePDFGenerator:
             ['Destination Label', cert_data['destination'].get('label', 'N/A')],
             ['File System', cert_data['destination'].get('fs', 'N/A')]
         ]
-        backup_table = Table(backup_data, colWidths=[2*inch, 4*inch])
-        backup_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        backup_table = kv_table(backup_data)
         story.append(backup_table)
         story.append(Spacer(1, 15))
         
@@ -231,16 +272,7 @@ class BackupCertificatePDFGenerator:
                 coverage_str = f"{coverage['samples']} samples"
             security_data.append(['Verification Coverage', coverage_str])
         
-        security_table = Table(security_data, colWidths=[2*inch, 4*inch])
-        security_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        security_table = kv_table(security_data)
         story.append(security_table)
         story.append(Spacer(1, 15))
         
@@ -252,48 +284,31 @@ class BackupCertificatePDFGenerator:
             ['Tool Version', cert_data['environment']['tool_version']],
             ['Containerized', str(cert_data['environment'].get('containerized', 'N/A'))]
         ]
-        env_table = Table(env_data, colWidths=[2*inch, 4*inch])
-        env_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        env_table = kv_table(env_data)
         story.append(env_table)
         story.append(Spacer(1, 20))
         
         # QR Code for verification
         story.append(Paragraph("Certificate Verification", heading_style))
         
-        # Create QR data - either verify_url or cert_id
-        qr_data = cert_data.get('verify_url', f"cert_id:{cert_data['cert_id']}")
-        qr_image = self.generate_qr_code(qr_data)
-        
-        # Center the QR code
-        qr_table = Table([[qr_image]], colWidths=[6*inch])
-        qr_table.setStyle(TableStyle([('ALIGN', (0, 0), (-1, -1), 'CENTER')]))
-        story.append(qr_table)
-        
-        story.append(Paragraph("Scan QR code to verify certificate authenticity", styles['Normal']))
+        if include_qr:
+            # Create QR data - either verify_url or cert_id
+            qr_data = cert_data.get('verify_url', f"cert_id:{cert_data['cert_id']}")
+            qr_image = self.generate_qr_code(qr_data)
+            
+            # Center the QR code
+            qr_table = Table([[qr_image]], colWidths=[6*inch])
+            qr_table.setStyle(_QR_TABLE_STYLE)
+            story.append(qr_table)
+            
+            story.append(Paragraph("Scan QR code to verify certificate authenticity", styles['Normal']))
         
         # Add verification URL if available
         if 'verify_url' in cert_data:
             verify_data = [
                 ['Verification Portal', create_clickable_url(cert_data['verify_url'], None, styles['Normal'])]
             ]
-            verify_table = Table(verify_data, colWidths=[2*inch, 4*inch])
-            verify_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            verify_table = kv_table(verify_data)
             story.append(Spacer(1, 10))
             story.append(verify_table)
         
@@ -315,16 +330,7 @@ class BackupCertificatePDFGenerator:
                 ['Signature', cert_data['signature']['sig'][:50] + '...']  # Truncated for display
             ]
         
-        sig_table = Table(sig_data, colWidths=[2*inch, 4*inch])
-        sig_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        sig_table = kv_table(sig_data, _SIG_TABLE_STYLE)
         story.append(sig_table)
         
         # Build PDF
@@ -429,10 +435,14 @@ def test_pdf_generation():
     output_path = "/tmp/test_backup_certificate.pdf"
     
     try:
-        success = generator.create_certificate_pdf(sample_cert, output_path)
+        # Render in memory and write the finished PDF in one call
+        buffer = BytesIO()
+        success = generator.create_certificate_pdf(sample_cert, buffer)
         if success:
+            with open(output_path, 'wb') as f:
+                size = f.write(buffer.getbuffer())
             print(f"PDF generated successfully: {output_path}")
-            print(f"File size: {os.path.getsize(output_path)} bytes")
+            print(f"File size: {size} bytes")
             return True
         else:
             print("PDF generation failed")
@@ -9,16 +9,12 @@ Tests PDF generation for audit-ready wipe certificates with:
 - Security validation
 """
 
-import json
 import sys
 import os
-import tempfile
-from datetime import datetime, timezone
-from pathlib import Path
+from io import BytesIO
 
 try:
     import jsonschema
-    from jsonschema import validate, ValidationError
 except ImportError:
     print("❌ Missing dependency: jsonschema")
     print("   Install with: pip install jsonschema")
@@ -46,14 +42,75 @@ except ImportError:
     print("   Install with: pip install qrcode[pil]")
     sys.exit(1)
 
-# Get project root and schema path
-PROJECT_ROOT = Path(__file__).parent.parent
-SCHEMA_PATH = PROJECT_ROOT / "certs" / "schemas" / "wipe_schema.json"
+from _qr_cache import render_qr_png
+from _schema_cache import get_validator
 
-def load_schema():
-    """Load the wipe certificate JSON schema"""
-    with open(SCHEMA_PATH, 'r') as f:
-        return json.load(f)
+# Styles don't depend on the certificate, so every PDF shares one set
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    textColor=colors.darkblue
+)
+_HEADER_STYLE = ParagraphStyle(
+    'CustomHeader',
+    parent=_STYLES['Heading2'], 
+    fontSize=14,
+    spaceAfter=12,
+    textColor=colors.darkblue
+)
+# Small text style for long content
+_SMALL_TEXT_STYLE = ParagraphStyle(
+    'SmallText',
+    parent=_STYLES['Normal'],
+    fontSize=8,
+    wordWrap='LTR'
+)
+
+
+def _section_table_style(label_background, font_size):
+    """Grid style shared by the label/value section tables"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), label_background),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+
+_CERT_INFO_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.lightgrey]),
+])
+_DEVICE_TABLE_STYLE = _section_table_style(colors.lightblue, 9)
+_POLICY_TABLE_STYLE = _section_table_style(colors.lightgreen, 9)
+_HPA_TABLE_STYLE = _section_table_style(colors.lightyellow, 9)
+_CMD_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+_VERIFY_TABLE_STYLE = _section_table_style(colors.lightcyan, 9)
+_EVIDENCE_TABLE_STYLE = _section_table_style(colors.lavender, 8)
+_SIG_TABLE_STYLE = _section_table_style(colors.mistyrose, 8)
+_LAYOUT_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
 
 def create_sample_wipe_certificate():
     """Create a sample wipe certificate for PDF generation"""
@@ -151,47 +208,32 @@ def create_sample_wipe_certificate():
 
 def generate_qr_code(data):
     """Generate QR code for certificate verification"""
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    
     if isinstance(data, dict):
         # Use the verify_url directly if available, otherwise use cert_id
         qr_text = data.get('verify_url', f"cert_id:{data.get('cert_id', 'N/A')}")
     else:
         qr_text = str(data)
     
-    qr.add_data(qr_text)
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Save to temporary file
-    temp_path = tempfile.mktemp(suffix=".png")
-    img.save(temp_path)
-    return temp_path
+    # reportlab reads the buffer while building, so each PDF gets its own
+    return BytesIO(render_qr_png(qr_text, error_correction=qrcode.constants.ERROR_CORRECT_L))
+
+# Unit names indexed by how many factors of 1024 fit in the value, capped at TB
+_BYTE_UNITS = ("bytes", "KB", "MB", "GB", "TB")
 
 def format_bytes(bytes_value):
     """Format bytes into human readable format"""
-    if bytes_value >= 1024**4:
-        return f"{bytes_value / 1024**4:.2f} TB"
-    elif bytes_value >= 1024**3:
-        return f"{bytes_value / 1024**3:.2f} GB" 
-    elif bytes_value >= 1024**2:
-        return f"{bytes_value / 1024**2:.2f} MB"
-    elif bytes_value >= 1024:
-        return f"{bytes_value / 1024:.2f} KB"
-    else:
+    # int() because JSON integers such as 1000204886016.0 may arrive as floats
+    exponent = min((max(int(bytes_value), 1).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    if exponent == 0:
         return f"{bytes_value} bytes"
+    return f"{bytes_value / (1 << (10 * exponent)):.2f} {_BYTE_UNITS[exponent]}"
 
 def wrap_long_text(text, max_length=50):
     """Wrap long text to fit in table cells"""
-    if len(str(text)) <= max_length:
-        return str(text)
-    return str(text)[:max_length-3] + "..."
+    text = str(text)
+    if len(text) <= max_length:
+        return text
+    return text[:max_length-3] + "..."
 
 def format_hash(hash_value, max_length=32):
     """Format hash values for display in tables"""
@@ -212,7 +254,8 @@ def format_url(url, max_length=45):
         return url_str
     # Show protocol and domain, then truncate
     if "://" in url_str:
-        protocol_domain = url_str.split("/")[0] + "//" + url_str.split("/")[2]
+        scheme, _, host = url_str.split("/", 3)[:3]
+        protocol_domain = f"{scheme}//{host}"
         if len(protocol_domain) < max_length - 5:
             return protocol_domain + "/..."
     return url_str[:max_length-3] + "..."
@@ -229,44 +272,45 @@ def create_clickable_url(url, display_text=None, style=None):
     link_text = f'<link href="{url}">{display_text}</link>'
     return Paragraph(link_text, style)
 
+_SECTION_COL_WIDTHS = [2*inch, 3.5*inch]
+_HPA_STATUS_TEXT = {True: "✓ CLEARED", False: "✗ NOT CLEARED"}
+
+def _section_table(rows, style, col_widths=_SECTION_COL_WIDTHS):
+    """Build a table with one of the shared section styles"""
+    table = Table(rows, colWidths=col_widths)
+    table.setStyle(style)
+    return table
+
+def _add_section(story, title, rows, style, col_widths=_SECTION_COL_WIDTHS):
+    """Append a section header, its table and the trailing spacer to the story"""
+    story.extend((
+        Paragraph(title, _HEADER_STYLE),
+        _section_table(rows, style, col_widths),
+        Spacer(1, 15),
+    ))
+
 def create_wipe_certificate_pdf(cert_data, output_path):
     """Generate professional PDF certificate for wipe operations"""
     doc = SimpleDocTemplate(output_path, pagesize=A4,
                           rightMargin=72, leftMargin=72,
                           topMargin=72, bottomMargin=18)
     
-    styles = getSampleStyleSheet()
-    story = []
+    device = cert_data['device']
+    policy = cert_data['policy']
+    hpa_dco = cert_data['hpa_dco']
+    verify = cert_data['verify']
+    evidence = cert_data['evidence']
+    linkage = cert_data['linkage']
+    signature = cert_data['signature']
+    metadata = cert_data['metadata']
+    issuer = cert_data['issuer']
+    environment = cert_data['environment']
     
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue
-    )
-    
-    header_style = ParagraphStyle(
-        'CustomHeader',
-        parent=styles['Heading2'], 
-        fontSize=14,
-        spaceAfter=12,
-        textColor=colors.darkblue
-    )
-    
-    # Small text style for long content
-    small_text_style = ParagraphStyle(
-        'SmallText',
-        parent=styles['Normal'],
-        fontSize=8,
-        wordWrap='LTR'
-    )
+    story = []
     
     # Title
-    story.append(Paragraph("SecureWipe Data Sanitization Certificate", title_style))
-    story.append(Paragraph("NIST SP 800-88 Compliant Wipe Operation", styles['Heading3']))
+    story.append(Paragraph("SecureWipe Data Sanitization Certificate", _TITLE_STYLE))
+    story.append(Paragraph("NIST SP 800-88 Compliant Wipe Operation", _STYLES['Heading3']))
     story.append(Spacer(1, 20))
     
     # Certificate Info Header
@@ -276,238 +320,129 @@ def create_wipe_certificate_pdf(cert_data, output_path):
         ["Certificate Version:", cert_data['certificate_version']],
         ["Created:", cert_data['created_at']],
         ["Result:", cert_data['result']],
-        ["Verification URL:", create_clickable_url(cert_data.get('verify_url', 'N/A'), None, small_text_style)]
+        ["Verification URL:", create_clickable_url(cert_data.get('verify_url', 'N/A'), None, _SMALL_TEXT_STYLE)]
     ]
     
-    cert_info_table = Table(cert_info_data, colWidths=[2*inch, 3.5*inch])
-    cert_info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.lightgrey]),
-    ]))
-    
-    story.append(cert_info_table)
-    story.append(Spacer(1, 20))
+    story.extend((_section_table(cert_info_data, _CERT_INFO_TABLE_STYLE), Spacer(1, 20)))
     
     # Device Information
-    story.append(Paragraph("Device Information", header_style))
     device_data = [
-        ["Model:", cert_data['device']['model']],
-        ["Serial Number:", cert_data['device']['serial']],
-        ["Bus Type:", cert_data['device']['bus']],
-        ["Capacity:", format_bytes(cert_data['device']['capacity_bytes'])],
-        ["Device Path:", cert_data['device'].get('path', 'N/A')],
-        ["Protocol Path:", cert_data['device'].get('protocol_path', 'N/A')],
-        ["Firmware:", cert_data['device'].get('firmware', 'N/A')]
+        ["Model:", device['model']],
+        ["Serial Number:", device['serial']],
+        ["Bus Type:", device['bus']],
+        ["Capacity:", format_bytes(device['capacity_bytes'])],
+        ["Device Path:", device.get('path', 'N/A')],
+        ["Protocol Path:", device.get('protocol_path', 'N/A')],
+        ["Firmware:", device.get('firmware', 'N/A')]
     ]
     
-    device_table = Table(device_data, colWidths=[2*inch, 3.5*inch])
-    device_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    
-    story.append(device_table)
-    story.append(Spacer(1, 15))
+    _add_section(story, "Device Information", device_data, _DEVICE_TABLE_STYLE)
     
     # Wipe Policy
-    story.append(Paragraph("Sanitization Policy", header_style))
     policy_data = [
-        ["NIST Level:", cert_data['policy']['nist_level']],
-        ["Method:", cert_data['policy']['method']],
-        ["Action Mapping:", cert_data['policy'].get('action_mapping', 'N/A')]
+        ["NIST Level:", policy['nist_level']],
+        ["Method:", policy['method']],
+        ["Action Mapping:", policy.get('action_mapping', 'N/A')]
     ]
     
-    policy_table = Table(policy_data, colWidths=[2*inch, 3.5*inch])
-    policy_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgreen),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'), 
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    
-    story.append(policy_table)
-    story.append(Spacer(1, 15))
+    _add_section(story, "Sanitization Policy", policy_data, _POLICY_TABLE_STYLE)
     
     # HPA/DCO Clearance
-    story.append(Paragraph("HPA/DCO Clearance", header_style))
-    
-    # Format commands properly
-    commands_text = ", ".join(cert_data['hpa_dco'].get('commands', []))
-    formatted_commands = Paragraph(wrap_long_text(commands_text, 60), small_text_style)
+    commands_text = ", ".join(hpa_dco.get('commands', []))
+    formatted_commands = Paragraph(wrap_long_text(commands_text, 60), _SMALL_TEXT_STYLE)
     
     hpa_data = [
-        ["Status:", "✓ CLEARED" if cert_data['hpa_dco']['cleared'] else "✗ NOT CLEARED"],
+        ["Status:", _HPA_STATUS_TEXT[bool(hpa_dco['cleared'])]],
         ["Commands:", formatted_commands]
     ]
     
-    hpa_table = Table(hpa_data, colWidths=[2*inch, 3.5*inch])
-    hpa_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightyellow),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    
-    story.append(hpa_table)
-    story.append(Spacer(1, 15))
+    _add_section(story, "HPA/DCO Clearance", hpa_data, _HPA_TABLE_STYLE)
     
     # Commands Executed
-    story.append(Paragraph("Commands Executed", header_style))
     cmd_headers = [["Command", "Exit Code", "Duration (ms)"]]
     cmd_data = []
     for cmd in cert_data['commands']:
         # Use Paragraph for command text to enable proper wrapping
-        cmd_text = Paragraph(wrap_long_text(cmd['cmd'], 45), small_text_style)
+        cmd_text = Paragraph(wrap_long_text(cmd['cmd'], 45), _SMALL_TEXT_STYLE)
         cmd_data.append([
             cmd_text,
             str(cmd['exit']),
             str(cmd['ms'])
         ])
     
-    cmd_table = Table(cmd_headers + cmd_data, colWidths=[3*inch, 1*inch, 1.5*inch])
-    cmd_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
-    
-    story.append(cmd_table)
-    story.append(Spacer(1, 15))
+    _add_section(story, "Commands Executed", cmd_headers + cmd_data, _CMD_TABLE_STYLE,
+                 col_widths=[3*inch, 1*inch, 1.5*inch])
     
     # Verification Results
-    story.append(Paragraph("Verification Results", header_style))
     verify_data = [
-        ["Strategy:", cert_data['verify']['strategy']],
-        ["Coverage:", f"{cert_data['verify']['coverage']['samples']} samples" if 'coverage' in cert_data['verify'] else 'N/A'],
-        ["Failures:", str(cert_data['verify']['failures'])],
-        ["Result:", cert_data['verify'].get('result', 'N/A')]
+        ["Strategy:", verify['strategy']],
+        ["Coverage:", f"{verify['coverage']['samples']} samples" if 'coverage' in verify else 'N/A'],
+        ["Failures:", str(verify['failures'])],
+        ["Result:", verify.get('result', 'N/A')]
     ]
     
-    verify_table = Table(verify_data, colWidths=[2*inch, 3.5*inch])
-    verify_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightcyan),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    
-    story.append(verify_table)
-    story.append(Spacer(1, 15))
+    _add_section(story, "Verification Results", verify_data, _VERIFY_TABLE_STYLE)
     
     # Evidence & Linkage
-    story.append(Paragraph("Evidence & Linkage", header_style))
     evidence_data = [
-        ["NVMe Status Code:", cert_data['evidence'].get('nvme_sanitize_status_code', 'N/A')],
-        ["Logs SHA256:", Paragraph(format_hash(cert_data['evidence'].get('logs_sha256', 'N/A')), small_text_style)],
-        ["Backup Certificate:", cert_data['linkage']['backup_cert_id']],
-        ["Certificate Hash:", Paragraph(format_hash(cert_data['metadata'].get('certificate_json_sha256', 'N/A')), small_text_style)]
+        ["NVMe Status Code:", evidence.get('nvme_sanitize_status_code', 'N/A')],
+        ["Logs SHA256:", Paragraph(format_hash(evidence.get('logs_sha256', 'N/A')), _SMALL_TEXT_STYLE)],
+        ["Backup Certificate:", linkage['backup_cert_id']],
+        ["Certificate Hash:", Paragraph(format_hash(metadata.get('certificate_json_sha256', 'N/A')), _SMALL_TEXT_STYLE)]
     ]
     
-    evidence_table = Table(evidence_data, colWidths=[2*inch, 3.5*inch])
-    evidence_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lavender),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    
-    story.append(evidence_table)
-    story.append(Spacer(1, 15))
+    _add_section(story, "Evidence & Linkage", evidence_data, _EVIDENCE_TABLE_STYLE)
     
     # Digital Signature & QR Code
-    story.append(Paragraph("Digital Signature & Verification", header_style))
+    story.append(Paragraph("Digital Signature & Verification", _HEADER_STYLE))
     
     # Generate QR code
-    qr_path = generate_qr_code(cert_data.get('metadata', {}).get('qr_payload', cert_data))
+    qr_png = generate_qr_code(metadata.get('qr_payload', cert_data))
     
     # Create signature table with QR code
     sig_data = [
-        ["Algorithm:", cert_data['signature']['alg']],
-        ["Public Key ID:", cert_data['signature']['pubkey_id']],
-        ["Signature:", Paragraph(format_hash(cert_data['signature']['sig'], 30), small_text_style)],
-        ["Issuer:", f"{cert_data['issuer']['organization']} ({cert_data['issuer']['country']})"]
+        ["Algorithm:", signature['alg']],
+        ["Public Key ID:", signature['pubkey_id']],
+        ["Signature:", Paragraph(format_hash(signature['sig'], 30), _SMALL_TEXT_STYLE)],
+        ["Issuer:", f"{issuer['organization']} ({issuer['country']})"]
     ]
     
     # Two column layout: signature info and QR code
-    sig_table = Table(sig_data, colWidths=[2*inch, 2.5*inch])
-    sig_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.mistyrose),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    sig_table = _section_table(sig_data, _SIG_TABLE_STYLE, col_widths=[2*inch, 2.5*inch])
     
     # Create layout with QR code
-    qr_img = Image(qr_path, width=1.5*inch, height=1.5*inch)
+    qr_img = Image(qr_png, width=1.5*inch, height=1.5*inch)
     
     layout_data = [[sig_table, qr_img]]
-    layout_table = Table(layout_data, colWidths=[4.5*inch, 1.5*inch])
-    layout_table.setStyle(TableStyle([
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
+    layout_table = _section_table(layout_data, _LAYOUT_TABLE_STYLE, col_widths=[4.5*inch, 1.5*inch])
     
-    story.append(layout_table)
-    story.append(Spacer(1, 20))
+    story.extend((layout_table, Spacer(1, 20)))
     
     # Footer
-    footer_text = f"Generated by {cert_data['issuer']['tool_name']} v{cert_data['issuer']['tool_version']} | " \
-                 f"Environment: {cert_data['environment']['os_kernel']} | " \
-                 f"Operator: {cert_data['environment']['operator']}"
-    story.append(Paragraph(footer_text, styles['Normal']))
+    footer_text = f"Generated by {issuer['tool_name']} v{issuer['tool_version']} | " \
+                 f"Environment: {environment['os_kernel']} | " \
+                 f"Operator: {environment['operator']}"
+    story.append(Paragraph(footer_text, _STYLES['Normal']))
     
     # Build PDF
     doc.build(story)
-    
-    # Clean up QR code temp file
-    try:
-        os.unlink(qr_path)
-    except:
-        pass
 
-def main():
-    print("Testing SecureWipe Wipe Certificate PDF Generation")
-    print("=" * 50)
-    
-    # Test certificate validation first
+def check_certificate_validation():
+    """Validate the sample certificate against the wipe schema"""
     print("Testing certificate validation...")
-    schema = load_schema()
     cert_data = create_sample_wipe_certificate()
-    
-    try:
-        validate(instance=cert_data, schema=schema)
-        print("Certificate validation: PASS")
-    except ValidationError as e:
-        print(f"Schema validation failed: {e.message}")
+    error = jsonschema.exceptions.best_match(get_validator().iter_errors(cert_data))
+    if error is not None:
+        print(f"Schema validation failed: {error.message}")
         print("Certificate validation: FAIL")
         return False
-    
-    # Generate PDF
+    print("Certificate validation: PASS")
+    return True
+
+def check_pdf_generation():
+    """Render the sample certificate to a PDF"""
     print("Generating PDF certificate...")
+    cert_data = create_sample_wipe_certificate()
     output_path = "/tmp/test_wipe_certificate.pdf"
     
     try:
@@ -515,17 +450,27 @@ def main():
         file_size = os.path.getsize(output_path)
         print(f"PDF generated successfully: {output_path}")
         print(f"File size: {file_size} bytes")
-        
-        print("=" * 50)
-        print("Test Result: SUCCESS")
         return True
-        
     except Exception as e:
         print(f"PDF generation failed: {e}")
-        print("=" * 50) 
-        print("Test Result: FAILED")
         return False
 
+def main():
+    print("Testing SecureWipe Wipe Certificate PDF Generation")
+    print("=" * 50)
+    
+    success = check_certificate_validation()
+    
+    # Rendering dominates the run time; SKIP_SLOW_PDF=1 checks validation only
+    if success and os.environ.get("SKIP_SLOW_PDF") == "1":
+        print("Skipping PDF generation (SKIP_SLOW_PDF=1)")
+    elif success:
+        success = check_pdf_generation()
+    
+    print("=" * 50)
+    print("Test Result: SUCCESS" if success else "Test Result: FAILED")
+    return success
+
 if __name__ == "__main__":
     success = main()
     sys.exit(0 if success else 1)
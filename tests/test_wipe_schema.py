@@ -12,42 +12,27 @@ Tests the new audit-ready wipe certificate JSON schema for:
 
 import json
 import sys
-import os
 from datetime import datetime, timezone
-from pathlib import Path
+
+import orjson
 
 try:
     import jsonschema
-    from jsonschema import validate, ValidationError
 except ImportError:
     print("❌ Missing dependency: jsonschema")
     print("   Install with: pip install jsonschema")
     sys.exit(1)
 
-# Get project root and schema path
-PROJECT_ROOT = Path(__file__).parent.parent
-SCHEMA_PATH = PROJECT_ROOT / "certs" / "schemas" / "wipe_schema.json"
-
-def load_schema():
-    """Load the wipe certificate JSON schema"""
-    try:
-        with open(SCHEMA_PATH, 'r') as f:
-            schema = json.load(f)
-        return schema
-    except FileNotFoundError:
-        print(f"❌ Schema file not found: {SCHEMA_PATH}")
-        sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"❌ Invalid JSON in schema: {e}")
-        sys.exit(1)
+from _schema_cache import PROJECT_ROOT, WIPE_SCHEMA_PATH, load_schema, get_validator
 
 def create_valid_wipe_certificate():
     """Create a valid wipe certificate that should pass validation"""
+    issued_at = datetime.now(timezone.utc).isoformat()
     return {
         "cert_type": "wipe",
         "cert_id": "TEST_WPE_2024_001", 
         "certificate_version": "v1.0.0",
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": issued_at,
         "issuer": {
             "organization": "SecureWipe (SIH)",
             "tool_name": "securewipe", 
@@ -133,7 +118,7 @@ def create_valid_wipe_certificate():
             "certificate_json_sha256": "f6789012345678901234567890123456789012345678901234567890abcdef12",
             "qr_payload": {
                 "cert_id": "TEST_WPE_2024_001",
-                "issued_at": datetime.now(timezone.utc).isoformat(),
+                "issued_at": issued_at,
                 "device_model": "Samsung SSD 980 PRO 1TB",
                 "result": "PASS",
                 "nist_level": "PURGE",
@@ -159,13 +144,10 @@ def create_invalid_wipe_certificate():
         }
     }
 
-def validate_certificate(schema, cert_data, test_name):
+def validate_certificate(cert_data, test_name):
     """Validate a certificate against the schema"""
-    try:
-        validate(instance=cert_data, schema=schema)
-        return True, None
-    except ValidationError as e:
-        return False, e
+    error = jsonschema.exceptions.best_match(get_validator().iter_errors(cert_data))
+    return error is None, error
 
 def test_field_presence(cert_data, required_fields):
     """Test that all required fields are present"""
@@ -179,9 +161,9 @@ def save_sample_certificate(cert_data, filename):
     """Save a sample certificate to file"""
     output_path = PROJECT_ROOT / "tests" / filename
     try:
-        with open(output_path, 'w') as f:
-            json.dump(cert_data, f, indent=2)
-        return output_path, os.path.getsize(output_path)
+        data = orjson.dumps(cert_data, option=orjson.OPT_INDENT_2)
+        output_path.write_bytes(data)
+        return output_path, len(data)
     except Exception as e:
         return None, f"Error: {e}"
 
@@ -191,7 +173,14 @@ def main():
     
     # Load schema
     print("Loading wipe certificate schema...")
-    schema = load_schema()
+    try:
+        schema = load_schema()
+    except FileNotFoundError:
+        print(f"❌ Schema file not found: {WIPE_SCHEMA_PATH}")
+        return False
+    except json.JSONDecodeError as e:  # orjson's error subclasses it
+        print(f"❌ Invalid JSON in schema: {e}")
+        return False
     
     if '$id' in schema:
         print(f"✓ Schema loaded successfully")
@@ -205,7 +194,7 @@ def main():
     # Test valid certificate
     print("Testing valid certificate...")
     valid_cert = create_valid_wipe_certificate()
-    is_valid, error = validate_certificate(schema, valid_cert, "valid")
+    is_valid, error = validate_certificate(valid_cert, "valid")
     
     if is_valid:
         print("✓ Valid certificate passed validation")
@@ -218,7 +207,7 @@ def main():
     print()
     print("Testing invalid certificate...")
     invalid_cert = create_invalid_wipe_certificate()
-    is_valid, error = validate_certificate(schema, invalid_cert, "invalid")
+    is_valid, error = validate_certificate(invalid_cert, "invalid")
     
     if not is_valid:
         print("✓ Invalid certificate correctly failed validation")
@@ -233,7 +222,7 @@ def main():
     print("Testing schema example...")
     if 'examples' in schema and len(schema['examples']) > 0:
         example = schema['examples'][0]
-        is_valid, error = validate_certificate(schema, example, "schema example")
+        is_valid, error = validate_certificate(example, "schema example")
         if is_valid:
             print("✓ Schema example is valid")
         else: